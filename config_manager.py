@@ -227,6 +227,7 @@ class ConfigManager:
                 "enabled": False,
                 "api_key": "",
                 "model": "mistralai/Mixtral-8x7B-Instruct-v0.1",
+                "fast_model": "meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo",
                 "max_tokens": 500,
                 "temperature": 0.7,
                 "description": "Together API configuration for LLM chat features",
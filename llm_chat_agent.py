@@ -6,80 +6,205 @@ Handles personal questions and movie requests with integrated multi-source searc
 
 import os
 import json
+import random
 import re
 import logging
 import difflib
-from typing import Dict, List, Optional, Any
+import functools
+import threading
+import copy
+import heapq
+import socket
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple, Iterator
 from together import Together
 import requests
 from session_manager import session_manager
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from collections import deque, OrderedDict
+from itertools import islice
+from urllib.parse import urlsplit
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    from rapidfuzz import process as rapidfuzz_process, fuzz
+except ImportError:
+    rapidfuzz_process = None
+
+# orjson parses and encodes JSON faster; its JSONDecodeError subclasses json.JSONDecodeError
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class EnhancedLLMChatAgent:
-    def __init__(self, api_key: str = None):
-        """Initialize Enhanced LLM Chat Agent with Together API and movie search agents"""
-        # Import config manager
-        try:
-            from config_manager import config_manager
-            self.config_manager = config_manager
-            
-            # Get API key from config manager or parameter
-            if api_key:
-                self.api_key = api_key
-            else:
-                self.api_key = self.config_manager.get_together_api_key()
-            
-            self.has_api_key = bool(self.api_key)
-            
-            # Get Together API configuration
-            self.together_config = self.config_manager.get_together_config()
-            
-        except ImportError:
-            # Fallback if config manager is not available
-            self.api_key = api_key or os.getenv('TOGETHER_API_KEY')
-            self.has_api_key = bool(self.api_key)
-            self.config_manager = None
-            self.together_config = {}
-        
-        if self.has_api_key:
-            self.client = Together(api_key=self.api_key)
-            self.model = "mistralai/Mixtral-8x7B-Instruct-v0.1"
-        else:
-            self.client = None
-            logger.warning("No Together API key provided. Using basic functionality only.")
-        
-        # Initialize movie search agents
-        self.movie_agents = {}
-        self._init_movie_agents()
-        
-        # Movie genres and categories
-        self.movie_genres = [
-            "action", "adventure", "comedy", "drama", "horror", "thriller", 
-            "sci-fi", "fantasy", "romance", "animation", "documentary", 
-            "crime", "mystery", "war", "western", "musical", "biography"
-        ]
-        
-        self.conversation_history = []
-        
-        # Personal context for better responses
-        self.agent_personality = {
-            "name": "AI Movie Assistant",
-            "role": "intelligent movie search and recommendation assistant",
-            "traits": ["friendly", "knowledgeable", "efficient", "enthusiastic about movies"]
-        }
-        
-    def analyze_user_intent(self, user_message: str, conversation_context: str = "") -> Dict[str, Any]:
-        """Analyze user intent to determine response type"""
-        # If no API key, use fallback analysis
-        if not self.has_api_key:
-            return self._fallback_intent_analysis(user_message)
-        
-        try:
-            system_prompt = """You are an intelligent assistant that analyzes user messages to understand their intent.
+# (connect, read) timeout for /search calls; scrapes are slow but a dead host should fail fast
+SEARCH_ENDPOINT_TIMEOUT = (3, 30)
+
+# Shared pool for agent searches; reused across requests instead of creating threads per call
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 4) * 4), thread_name_prefix='mv-search')
+
+# Number of LLM intent analyses kept for repeated messages
+INTENT_CACHE_SIZE = 512
+
+# Unique movies after which search_movies_with_sources stops waiting for more agents
+SEARCH_ENOUGH_RESULTS = 40
+
+# Size and lifetime (seconds) of the search result caches
+SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_TTL = 120
+
+# Size and lifetime (seconds) of the conversational reply cache
+RESPONSE_CACHE_SIZE = 256
+RESPONSE_CACHE_TTL = 600
+
+# Smaller, quicker Together model for short templated replies; override with together_api.fast_model
+FAST_MODEL = "meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo"
+
+# Output caps for user-facing replies; the prompts ask for a few sentences
+RESPONSE_MAX_TOKENS = 250
+CONFIRMATION_MAX_TOKENS = 120  # "found N movies, click Extract Links" replies
+INFORMATION_MAX_TOKENS = 200
+SUGGESTIONS_MAX_TOKENS = 80  # five short titles, one per line
+# Stop sequence for capped replies that start rambling into extra paragraphs
+REPLY_STOP = ["\n\n\n"]
+
+# Token budget for the conversation history sent with each prompt
+HISTORY_TOKEN_BUDGET = 1500
+
+# Shorter messages (after stripping), or ones without letters or digits, are answered without the LLM
+MIN_LLM_MESSAGE_CHARS = 3
+
+# Known movie database used by the fallback intent analysis when the LLM API fails
+KNOWN_MOVIES = {
+    "rrr": {
+        "full_title": "RRR",
+        "release_year": "2022",
+        "alternate_names": ["RRR (Rise Roar Revolt)", "Roudram Ranam Rudhiram"],
+        "key_details": "Telugu epic action film by S.S. Rajamouli starring Ram Charan and Jr. NTR",
+        "language": "telugu",
+        "genres": ["action", "drama"],
+        "search_variations": ["RRR", "RRR 2022", "RRR movie", "RRR telugu"]
+    },
+    "avatar": {
+        "full_title": "Avatar",
+        "release_year": "2009",
+        "alternate_names": ["Avatar: The Way of Water (2022 sequel)"],
+        "key_details": "James Cameron sci-fi film starring Sam Worthington",
+        "language": "english",
+        "genres": ["sci-fi", "action"],
+        "search_variations": ["Avatar", "Avatar 2009", "Avatar James Cameron"]
+    },
+    "john wick": {
+        "full_title": "John Wick",
+        "release_year": "2014",
+        "alternate_names": ["John Wick Chapter series"],
+        "key_details": "Action thriller starring Keanu Reeves",
+        "language": "english",
+        "genres": ["action", "thriller"],
+        "search_variations": ["John Wick", "John Wick 2014", "John Wick movie"]
+    },
+    "avengers endgame": {
+        "full_title": "Avengers: Endgame",
+        "release_year": "2019",
+        "alternate_names": ["Endgame"],
+        "key_details": "Marvel superhero film, final Infinity Saga movie",
+        "language": "english",
+        "genres": ["action", "adventure"],
+        "search_variations": ["Avengers Endgame", "Avengers: Endgame", "Endgame"]
+    },
+    "kgf": {
+        "full_title": "K.G.F: Chapter 1",
+        "release_year": "2018",
+        "alternate_names": ["KGF", "K.G.F Chapter 2 (2022)"],
+        "key_details": "Kannada action film starring Yash",
+        "language": "kannada",
+        "genres": ["action", "drama"],
+        "search_variations": ["KGF", "K.G.F", "KGF Chapter 1"]
+    },
+    "pushpa": {
+        "full_title": "Pushpa: The Rise",
+        "release_year": "2021",
+        "alternate_names": ["Pushpa Part 1"],
+        "key_details": "Telugu action drama starring Allu Arjun",
+        "language": "telugu",
+        "genres": ["action", "drama"],
+        "search_variations": ["Pushpa", "Pushpa The Rise", "Pushpa movie"]
+    },
+    "mahavatar narsimha": {
+        "full_title": "Mahavatar Narsimha",
+        "release_year": "2000",
+        "alternate_names": ["Mahavatar Narasimha", "Narsimha Avatar"],
+        "key_details": "Telugu mythological film starring Nandamuri Balakrishna, directed by B. Gopal",
+        "language": "telugu",
+        "genres": ["mythology", "drama"],
+        "search_variations": ["Mahavatar Narsimha", "Mahavatar Narasimha", "Narsimha", "Mahavatar Narsimha 2000"]
+    }
+}
+
+# Lookup structures over KNOWN_MOVIES, built once at import
+_KNOWN_KEYS = tuple(KNOWN_MOVIES)
+_KNOWN_ALT_NAMES = {key: tuple(alt.lower() for alt in movie["alternate_names"]) for key, movie in KNOWN_MOVIES.items()}
+_ALT_INDEX = {alt: key for key, alts in _KNOWN_ALT_NAMES.items() for alt in alts}
+
+# Keyword groups used by the fallback intent analysis, matched as substrings of the lowercased message
+FALLBACK_INTENT_KEYWORDS = {
+    "date_time": ('date', 'time', 'today', 'now', 'current', 'what day', 'what time', 'clock', 'calendar'),
+    "info": ('what is', 'what are', 'how does', 'explain', 'define', 'meaning', 'why', 'where', 'when'),
+    "question": ('?', 'what', 'how', 'why', 'where', 'when', 'who'),
+    "info_exclude": ('movie', 'film', 'how are you', 'who are you'),
+    "greeting": ('hello', 'hi', 'hey', 'good morning', 'good evening', 'good afternoon'),
+    "personal": ('how are you', 'what are you', 'who are you', 'tell me about yourself', 'feeling', 'mood'),
+    "movie": ('movie', 'film', 'watch', 'download', 'stream', 'cinema', 'bollywood', 'hollywood', 'show', 'series'),
+    "mood": ('exciting', 'funny', 'romantic', 'scary', 'thrilling', 'action-packed', 'laugh', 'cry'),
+    "theme": ('superhero', 'space', 'war', 'family', 'crime', 'zombie', 'vampire', 'magic', 'marvel', 'dc', 'disney'),
+    "franchise": ('marvel', 'dc', 'disney', 'pixar', 'star wars', 'harry potter', 'fast and furious', 'john wick'),
+    "mood_exciting": ('exciting', 'action-packed', 'thrilling'),
+    "mood_funny": ('funny', 'laugh', 'comedy'),
+    "mood_romantic": ('romantic', 'romance', 'love'),
+    "mood_scary": ('scary', 'horror', 'fear'),
+    "language_hindi": ('hindi', 'bollywood'),
+    "language_english": ('english', 'hollywood'),
+    "language_regional": ('tamil', 'telugu', 'malayalam'),
+    "latest": ('latest', 'new', 'recent'),
+}
+
+# Genres picked out of movie requests, in the order they go into the search query
+MOVIE_GENRES = (
+    "action", "adventure", "comedy", "drama", "horror", "thriller",
+    "sci-fi", "fantasy", "romance", "animation", "documentary",
+    "crime", "mystery", "war", "western", "musical", "biography"
+)
+
+# Frozen copies of the groups for set checks against matcher hits, plus the unions checked together
+_FALLBACK_KEYWORD_SETS = {category: frozenset(keywords) for category, keywords in FALLBACK_INTENT_KEYWORDS.items()}
+_FALLBACK_KEYWORD_SETS["info_or_question"] = _FALLBACK_KEYWORD_SETS["info"] | _FALLBACK_KEYWORD_SETS["question"]
+_FALLBACK_KEYWORD_SETS["movie_related"] = frozenset().union(
+    *(_FALLBACK_KEYWORD_SETS[category] for category in ("movie", "mood", "theme", "franchise"))
+)
+_FALLBACK_KEYWORD_SETS["genre"] = frozenset(MOVIE_GENRES)
+
+# System prompt for LLM intent analysis; kept byte-identical across calls
+INTENT_SYSTEM_PROMPT = """You are an intelligent assistant that analyzes user messages to understand their intent.
 
 CRITICAL: When users ask for movie recommendations (like "good action movies", "best comedies", "latest movies"), you MUST populate the movie_titles array with specific movie names.
 
@@ -142,18 +267,645 @@ EXAMPLES:
 
 REMEMBER: Always populate movie_titles array for any movie recommendation request!"""
 
-            # Attach recent session context to help handle follow-ups like "yes"/"no"
-            if conversation_context:
-                system_prompt += f"\n\nConversation context (for reference):\n{conversation_context[:1500]}"
+# Words that mark a message as movie-related in process_movie_request
+MOVIE_INDICATORS = (
+    'download', 'watch', 'movie', 'film', 'latest', 'new', 'release', 'quality',
+    'hindi', 'english', 'tamil', 'telugu', 'bollywood', 'hollywood', '2023', '2024',
+    'mp4', 'mkv', 'hd', '720p', '1080p', '4k'
+)
 
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ]
+# Output format used when a reply and its search suggestions share one completion
+MOVIE_RESPONSE_WITH_SUGGESTIONS_FORMAT = """Also suggest 5 movie titles or search terms the user could try next.
+
+Respond ONLY in JSON format:
+{
+    "response": "your reply to the user",
+    "suggestions": ["John Wick", "Mission Impossible", "Fast and Furious", "Mad Max: Fury Road", "The Raid"]
+}"""
+
+# System prompt for generate_search_suggestions; identical on every call
+SEARCH_SUGGESTIONS_SYSTEM_PROMPT = """Generate 5 movie search suggestions based on the user's message.
+Return only a simple list of movie titles or search terms, one per line.
+Focus on popular, well-known movies that match their request.
+
+Examples:
+- If they want action: "John Wick", "Mission Impossible", "Fast and Furious"
+- If they want comedy: "The Hangover", "Superbad", "Anchorman"
+- If they mention a year: include popular movies from that year"""
+
+# Static system prompts for the search result replies; the request details follow in a
+# separate system message so every call shares the same prompt prefix
+SIMPLE_MOVIE_SYSTEM_PROMPT = """You are a movie download assistant. The user searched for movies and you found results.
+
+A following system message gives the user's request, whether it is for a specific movie, how many movies were found and any movie research.
+
+IMPORTANT: DO NOT list individual movies in your response. The UI displays movies in cards below your response.
+
+RESPOND WITH:
+1. Confirm you found the movie(s) they wanted
+2. Mention the number of results found
+3. Guide them to click "Extract Links" to get download links
+4. Be enthusiastic about helping them download movies
+
+If specific movie: Confirm if this matches what they wanted
+If general request: Mention the variety of options found
+
+Keep response focused on DOWNLOADING and be concise."""
+
+DOWNLOAD_RESPONSE_SYSTEM_PROMPT = """You are a movie download assistant. Users come here specifically to download movies.
+
+IMPORTANT: DO NOT list individual movies in your response. The UI displays movies in cards below your response.
+
+A following system message gives the user's request, whether it is for a specific movie, the search results and any movie research.
+
+RESPOND WITH:
+1. Confirm you found the movie(s) they wanted
+2. Highlight the available sources and qualities
+3. Guide them to click "Extract Links" to get download links
+4. Be enthusiastic about helping them download movies
+
+If specific movie: Confirm if this matches what they wanted
+If general request: Mention the variety of options found
+
+Keep response focused on DOWNLOADING, not streaming platforms."""
+
+NO_RESULTS_SYSTEM_PROMPT = """You are a movie download assistant. The user searched for a movie but we couldn't find it in our download sources.
+
+A following system message gives what the user searched for, the search query used and any movie research.
+
+PROVIDE A HELPFUL RESPONSE:
+1. Acknowledge the specific movie they wanted (if you have research info)
+2. Explain that it's not currently available in our download sources
+3. Suggest possible reasons (too new, different spelling, not yet released)
+4. Offer to try alternative search terms
+5. Suggest similar movies if possible
+
+Be helpful and encouraging, not dismissive. Focus on finding download solutions."""
+
+# Persona-specific prompts, formatted once per agent with its name or persona header
+INFORMATION_SYSTEM_PROMPT = """You are {name}, but the user is asking a general knowledge question, not about movies.
+
+IMPORTANT: You should provide a helpful, accurate answer to their question, but then gently redirect the conversation back to movies since that's your specialty.
+
+Be informative but concise. After answering their question, suggest how you can help them with movies."""
+
+GENERAL_SYSTEM_PROMPT = """{persona_header}
+
+The user said something that's not specifically about movies or personal questions.
+Respond helpfully and try to guide the conversation toward movies if appropriate.
+Be conversational and show your movie expertise.
+
+Keep responses concise but engaging."""
+
+MOVIE_RESPONSE_SYSTEM_PROMPT = """{persona_header}
+
+IMPORTANT: DO NOT list individual movies in your response. The UI already displays movies in a structured format below your response.
+
+A following system message describes what the user wants, any movie research details, their preferences and the search results.
+
+RESPOND INTELLIGENTLY:
+
+If this is a SPECIFIC MOVIE request and movies were found:
+- Confirm if the found movie matches what they're looking for
+- Mention the movie details you researched (title, year, key info)
+- Ask for confirmation using the researched full title: "Is this the <full title> you were looking for?"
+- Highlight the available qualities and sources
+
+If this is a SPECIFIC MOVIE request but no movies found:
+- Acknowledge the specific movie they wanted
+- Mention the correct details you found about the movie
+- Suggest alternative search terms or spellings
+- Offer to search for similar movies or the sequel/prequel
+
+If this is a GENERAL movie request:
+- Acknowledge their preferences and mood
+- Comment on the variety of results found
+- Give personalized recommendations based on their criteria
+
+Be helpful, specific, and always confirm when dealing with specific movie requests!"""
+
+# Movie research fields shown in request context messages, with their labels
+_RESEARCH_FIELDS = (("full_title", "Title"), ("release_year", "Year"), ("key_details", "Details"))
+# Fuller research block for the main movie response prompt
+_MOVIE_RESEARCH_FIELDS = (("full_title", "Full Title"), ("release_year", "Release Year"),
+                          ("key_details", "Key Details"), ("alternate_names", "Alternate Names"))
+
+# Patterns compiled once at import instead of on every request
+_YEAR_RE = re.compile(r'\b(?:19|20)\d{2}\b')
+_CLEAN_RE = re.compile(r'\b(movie|film|watch|download)\b')
+_PUNCT_RE = re.compile(r'[^\w\s]')
+# Same deletion as _PUNCT_RE for ASCII text, built from the regex so the two can't drift
+_ASCII_PUNCT_TABLE = str.maketrans('', '', ''.join(_PUNCT_RE.findall(''.join(map(chr, range(128))))))
+_DIGIT_RE = re.compile(r'\d')
+_WORD_RE = re.compile(r'\w+')
+
+# Greeting and request openers that rule out a bare movie title
+_BAD_TITLE_STARTS = ("hello", "hi ", "hey ", "how are", "what is", "who are", "i want", "i need", "suggest")
+
+# One suggestion per non-blank line, without a leading bullet or list number
+_SUGGESTION_LINE_RE = re.compile(r'^[ \t]*(?:[-*\u2022]+|\d+[.)])?[ \t]*(\S.*?)[ \t-]*$', re.MULTILINE)
+
+# Suggestions used when there is nothing to base them on or the LLM call fails
+DEFAULT_SEARCH_SUGGESTIONS = ("Avengers Endgame", "The Dark Knight", "Inception", "Interstellar", "John Wick")
+
+# Canned search suggestions for common genre requests
+GENRE_SUGGESTIONS = {
+    "action": ["John Wick", "Mission Impossible", "Fast and Furious", "Mad Max Fury Road", "The Raid"],
+    "comedy": ["The Hangover", "Superbad", "Anchorman", "Dumb and Dumber", "Step Brothers"],
+    "horror": ["The Conjuring", "Hereditary", "Get Out", "A Quiet Place", "It"],
+    "romance": ["The Notebook", "Titanic", "La La Land", "Pride and Prejudice", "Dilwale Dulhania Le Jayenge"],
+    "thriller": ["Se7en", "Gone Girl", "Prisoners", "Shutter Island", "Drishyam"],
+    "sci-fi": ["Interstellar", "Inception", "The Matrix", "Blade Runner 2049", "Dune"],
+    "animation": ["Toy Story", "Spider-Man Into the Spider-Verse", "Coco", "Inside Out", "Kung Fu Panda"],
+    "superhero": ["Avengers Endgame", "The Dark Knight", "Spider-Man No Way Home", "Iron Man", "Logan"],
+}
+
+# Keywords checked in order against the lowercased message, mapped to a GENRE_SUGGESTIONS key
+GENRE_SUGGESTION_KEYWORDS = (
+    ("action", "action"),
+    ("comed", "comedy"),
+    ("funny", "comedy"),
+    ("horror", "horror"),
+    ("scary", "horror"),
+    ("romance", "romance"),
+    ("romantic", "romance"),
+    ("thriller", "thriller"),
+    ("sci-fi", "sci-fi"),
+    ("science fiction", "sci-fi"),
+    ("animat", "animation"),
+    ("cartoon", "animation"),
+    ("superhero", "superhero"),
+)
+
+# Mood keywords checked in order when building a search query from mood alone
+MOOD_SEARCH_QUERIES = (
+    ("exciting", "action movies"),
+    ("action", "action movies"),
+    ("funny", "comedy movies"),
+    ("laugh", "comedy movies"),
+    ("romantic", "romance movies"),
+    ("scary", "horror movies"),
+)
+# Every mood keyword in one alternation; the first one mentioned picks the query
+_MOOD_RE = re.compile('|'.join(re.escape(keyword) for keyword, _ in MOOD_SEARCH_QUERIES))
+_MOOD_QUERIES = dict(MOOD_SEARCH_QUERIES)
+
+# Intents answered without search results; these can be analyzed and answered in one completion
+CONVERSATIONAL_INTENTS = ("greeting", "personal", "general_chat", "information_request")
+
+# Extra instructions when intent analysis and the reply share one completion
+CONVERSATIONAL_RESPONSE_FORMAT = """Besides the intent fields, when intent_type is "greeting", "personal", "general_chat" or "information_request" also include a "response" field with your reply to the user:
+- Be warm, friendly and conversational
+- Keep it to 2-3 sentences
+- For "information_request", answer the question accurately and concisely first
+- Gently guide the conversation toward movies when it fits naturally
+
+Respond ONLY with the JSON object."""
+
+# strftime templates for date/time replies, picked by the first word found in the message
+DATE_TIME_REPLIES = (
+    ("time", "The current time is %I:%M %p. Is there a specific movie you'd like to watch today?"),
+    ("day", "Today is %A. Perfect day for watching a good movie! What genre are you in the mood for?"),
+)
+DATE_REPLY = "Today's date is %A, %B %d, %Y. How about we find you a great movie to watch today?"
+
+# Replies used without an API key or when the completion fails
+GENERAL_FALLBACK_REPLY = "I'm here to help you discover amazing movies! Is there anything specific you'd like to watch, or would you like me to suggest something based on your mood?"
+DOWNLOAD_FALLBACK_REPLY = "Great! I found {total_found} movies for you with download links. Click 'Extract Links' on any movie below to get the download options!"
+NO_RESULTS_RESEARCH_FALLBACK_REPLY = "I understand you're looking for '{title}' ({year}). Unfortunately, it's not currently available in our download sources. This could be because it's very new, not yet released, or might be listed under a different name. Try searching with alternative spellings or let me know if you'd like suggestions for similar movies!"
+NO_RESULTS_FALLBACK_REPLY = "I couldn't find '{query}' in our current download sources. This might be because it's very new, not yet released, or listed differently. Try alternative spellings or let me know if you'd like suggestions for similar movies!"
+
+# Bare greetings and confirmations are answered from canned replies without an LLM call
+CLEAR_GREETINGS = frozenset({"hello", "hi", "hey", "hlo", "helo", "hallo"})
+AFFIRMATIONS = frozenset({"yes", "y", "yeah", "yep", "correct", "exactly", "right", "sure", "ok", "okay"})
+CANNED_GREETINGS = (
+    "Hello! I'm your AI movie assistant. I'm here to help you discover amazing movies. What kind of movies are you in the mood for today?",
+    "Hi there! Ready to find something great to watch? Tell me a movie title, a genre or your mood and I'll take it from there.",
+    "Hey! I can help you find and download movies. What are you in the mood for - action, comedy, romance or something else?",
+)
+AFFIRMATION_CLARIFIER = "Great! Which movie would you like me to look up? Tell me a title, or a genre or mood and I'll suggest some."
+
+# Cached calendar year for "latest" searches, refreshed hourly so long-running workers roll over
+_year_cache = {"year": 0, "expires": 0.0}
+
+def _current_year() -> int:
+    """Return the current year without calling datetime.now() on every request"""
+    now = time.monotonic()
+    if now >= _year_cache["expires"]:
+        _year_cache["year"] = datetime.now().year
+        _year_cache["expires"] = now + 3600
+    return _year_cache["year"]
+
+def _extract_json_object(text: str) -> Optional[str]:
+    """Return the first balanced {...} object in text, found in a single pass that skips braces inside strings"""
+    start = text.find('{')
+    if start == -1:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+def _format_movie_line(movie: Dict[str, Any]) -> str:
+    """Format one search result as a prompt context line"""
+    get = movie.get
+    quality = get('quality', 'Unknown')
+    if isinstance(quality, list):
+        quality = ', '.join(map(str, quality))
+    return f"- {get('title', 'Unknown')} ({get('year', 'Unknown')}) - {quality} from {get('source', 'Unknown')}"
+
+# Relevance bonus for "latest" requests by age in years (older movies get 10)
+_RECENCY_BONUS = ((1, 200), (2, 150), (3, 100), (5, 50))
+
+# Relevance bonus by source reliability, checked in order
+_SOURCE_BONUS = (("downloadhub", 3), ("movierulz", 2), ("moviezwap", 1))
+
+def _fmt_fields(data: Dict[str, Any], fields: Tuple[Tuple[str, str], ...]) -> str:
+    """One "- Label: value" line per populated (key, label) field"""
+    return "\n".join(f"- {label}: {value}" for key, label in fields if (value := data.get(key)))
+
+def _research_context(movie_research: Dict[str, Any], fields: Tuple[Tuple[str, str], ...] = _RESEARCH_FIELDS,
+                      heading: str = "MOVIE RESEARCH:") -> str:
+    """Movie research block for a request context message, empty when there is no research"""
+    if not movie_research:
+        return ""
+    return "\n".join(filter(None, (heading, _fmt_fields(movie_research, fields))))
+
+def _no_results_fallback(movie_research: Dict[str, Any], search_query: str) -> str:
+    """Canned no-results reply, naming the researched title when there is one"""
+    if movie_research.get('full_title'):
+        return NO_RESULTS_RESEARCH_FALLBACK_REPLY.format(title=movie_research['full_title'],
+                                                         year=movie_research.get('release_year', 'Unknown year'))
+    return NO_RESULTS_FALLBACK_REPLY.format(query=search_query)
+
+def _normalize_query(query: str) -> str:
+    """Lowercase a search query and collapse its whitespace, for use as a cache key"""
+    return ' '.join(query.lower().split())
+
+def _message_key(message: str) -> str:
+    """Reduce a message to its words, so case, punctuation and spacing don't matter; word order still does"""
+    return ' '.join(_WORD_RE.findall(message.lower()))
+
+def _title_key(movie: Dict[str, Any]) -> str:
+    """Normalized title used to spot duplicate search results"""
+    return _strip_punct(movie.get('title', '').lower().strip())
+
+def _strip_punct(text: str) -> str:
+    """Remove punctuation, using the translate table for ASCII and the regex otherwise"""
+    return text.translate(_ASCII_PUNCT_TABLE) if text.isascii() else _PUNCT_RE.sub('', text)
+
+def _prep_movie(movie: Dict[str, Any]) -> Dict[str, Any]:
+    """Store lowercased title, quality and source on the movie as `_` scratch fields, once per result"""
+    if '_title_lc' not in movie:
+        quality = movie.get('quality', '')
+        movie['_title_lc'] = movie.get('title', '').lower().strip()
+        movie['_quality_lc'] = (' '.join(map(str, quality)) if isinstance(quality, list) else str(quality)).lower()
+        movie['_source_lc'] = movie.get('source', '').lower()
+    return movie
+
+def _public_movie(movie: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a movie without its `_` scratch fields, for results leaving the agent"""
+    return {key: value for key, value in movie.items() if not key.startswith('_')}
+
+@functools.lru_cache(maxsize=2048)
+def _match_known_movie(message_lower: str) -> Optional[str]:
+    """KNOWN_MOVIES key a lowercased message refers to, or None; cached since it runs on every turn"""
+    # Clean the message for matching; nothing left means nothing to match
+    clean_message = _CLEAN_RE.sub('', message_lower).strip()
+    if not clean_message:
+        return None
+    
+    # Exact title or alternate name hits need no fuzzy matching
+    movie_key = message_lower if message_lower in KNOWN_MOVIES else _ALT_INDEX.get(clean_message)
+    if movie_key:
+        return movie_key
+    
+    # Fuzzy match against known titles (rapidfuzz when available, difflib otherwise)
+    if rapidfuzz_process is not None:
+        match = rapidfuzz_process.extractOne(message_lower, _KNOWN_KEYS, scorer=fuzz.ratio, score_cutoff=60)
+        if match:
+            return match[0]
+    else:
+        close = difflib.get_close_matches(message_lower, _KNOWN_KEYS, n=1, cutoff=0.6)
+        if close:
+            return close[0]
+    
+    # Check for exact matches or close matches
+    for movie_key in _KNOWN_KEYS:
+        if (movie_key in clean_message or 
+            clean_message in movie_key or
+            any(alt in clean_message for alt in _KNOWN_ALT_NAMES[movie_key])):
+            return movie_key
+    
+    return None
+
+class _TTLCache:
+    """Thread-safe LRU cache whose entries optionally expire; values are deep-copied in and out"""
+    
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key) -> Any:
+        """Return a copy of the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+        # Callers adjust results in place, so never hand out the cached object itself
+        return copy.deepcopy(value)
+    
+    def set(self, key, value: Any):
+        """Cache a copy of value, evicting the least recently used entry when full"""
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+def _trie_pattern(words) -> str:
+    """Build a regex alternation shaped like a prefix trie, so each position is matched in one walk"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A word may end here, so the longer continuations are optional
+        return f'(?:{body})?' if '' in node else body
+    
+    return build(trie)
+
+class _KeywordMatcher:
+    """Find which of a fixed set of keywords occur as substrings of a text in one scan"""
+    
+    def __init__(self, keywords):
+        self.keywords = tuple(dict.fromkeys(keywords))
+        self._automaton = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            # The lookahead reports the longest keyword starting at each position; every
+            # keyword contained in that match occurs too, so expand hits through this map
+            self._pattern = re.compile(f'(?=({_trie_pattern(self.keywords)}))')
+            self._contained = {
+                longer: frozenset(keyword for keyword in self.keywords if keyword in longer)
+                for longer in self.keywords
+            }
+    
+    def contains_any(self, text: str) -> bool:
+        """Return whether any keyword occurs in text, stopping at the first hit"""
+        if self._automaton is None:
+            return self._pattern.search(text) is not None
+        return next(self._automaton.iter(text), None) is not None
+    
+    def find(self, text: str) -> set:
+        """Return the set of keywords found in text"""
+        if self._automaton is None:
+            hits = set()
+            for longest in set(self._pattern.findall(text)):
+                hits |= self._contained[longest]
+            return hits
+        return {keyword for _, keyword in self._automaton.iter(text)}
+
+class EnhancedLLMChatAgent:
+    def __init__(self, api_key: str = None):
+        """Initialize Enhanced LLM Chat Agent with Together API and movie search agents"""
+        # Import config manager
+        try:
+            from config_manager import config_manager
+            self.config_manager = config_manager
+            
+            # Get API key from config manager or parameter
+            if api_key:
+                self.api_key = api_key
+            else:
+                self.api_key = self.config_manager.get_together_api_key()
+            
+            self.has_api_key = bool(self.api_key)
+            
+            # Get Together API configuration
+            self.together_config = self.config_manager.get_together_config()
+            
+        except ImportError:
+            # Fallback if config manager is not available
+            self.api_key = api_key or os.getenv('TOGETHER_API_KEY')
+            self.has_api_key = bool(self.api_key)
+            self.config_manager = None
+            self.together_config = {}
+        
+        # The Together client and movie search agents are created on first use
+        self._client = None
+        self._movie_agents = None
+        self._lazy_init_lock = threading.Lock()
+        
+        # Set even without an API key: reply builders pass these to _llm_respond, which then falls back
+        self.model = "mistralai/Mixtral-8x7B-Instruct-v0.1"
+        # Templated replies (result confirmations, suggestions) don't need the larger model
+        self.fast_model = self.together_config.get('fast_model') or FAST_MODEL
+        
+        if self.has_api_key:
+            # Create the client and pay DNS/TLS setup before the first user request needs it
+            threading.Thread(target=self._warmup_client, daemon=True).start()
+        else:
+            logger.warning("No Together API key provided. Using basic functionality only.")
+        
+        # Pooled keep-alive HTTP session for calls to the local /search endpoint
+        self._http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0)
+        self._http.mount('http://', adapter)
+        self._http.mount('https://', adapter)
+        self._http.headers.update({'Content-Type': 'application/json', 'User-Agent': 'MovieAgent/1'})
+        
+        # Base URL of the last /search call that answered, tried first next time
+        self._last_good_base_url: Optional[str] = None
+        
+        # LRU cache of LLM intent analyses keyed by the normalized message and context
+        self._intent_cache = _TTLCache(INTENT_CACHE_SIZE)
+        
+        # Messages of submitted intent batches by batch id, in custom_id order
+        self._intent_batches: Dict[str, List[str]] = {}
+        
+        # Replies to conversational messages, reused for equivalent wording
+        self._response_cache = _TTLCache(RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+        
+        # Short-lived caches for repeated searches (affirmations, overlapping variations)
+        self._search_cache = _TTLCache(SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+        self._agent_search_cache = _TTLCache(SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+        
+        self._indicator_matcher = _KeywordMatcher(MOVIE_INDICATORS)
+        
+        # Every keyword the fallback intent analysis looks for, scanned in a single pass
+        self._keyword_matcher = _KeywordMatcher(
+            [keyword for group in FALLBACK_INTENT_KEYWORDS.values() for keyword in group] + list(MOVIE_GENRES)
+        )
+        
+        # Only the last few turns are sent to the model, so keep a bounded window
+        # whose token total stays within HISTORY_TOKEN_BUDGET
+        self.conversation_history = deque(maxlen=8)
+        self._history_tokens = deque()
+        self._history_tok_total = 0
+        self._tok = None
+        if tiktoken is not None:
+            try:
+                self._tok = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logger.warning("Tokenizer unavailable, estimating history tokens: %s", e)
+        
+        # Personal context for better responses
+        self.agent_personality = {
+            "name": "AI Movie Assistant",
+            "role": "intelligent movie search and recommendation assistant",
+            "traits": ["friendly", "knowledgeable", "efficient", "enthusiastic about movies"]
+        }
+        
+        # Shared opening of the persona prompts, built once so every prompt starts with identical text
+        self._persona_header = (
+            f"You are {self.agent_personality['name']}, a {self.agent_personality['role']}.\n"
+            f"You are {', '.join(self.agent_personality['traits'])}."
+        )
+        self._information_system_prompt = INFORMATION_SYSTEM_PROMPT.format(name=self.agent_personality['name'])
+        self._general_system_prompt = GENERAL_SYSTEM_PROMPT.format(persona_header=self._persona_header)
+        self._movie_system_prompt = MOVIE_RESPONSE_SYSTEM_PROMPT.format(persona_header=self._persona_header)
+        
+        # Count of LLM calls skipped for too-short input, for debug logging
+        self._short_input_skips = 0
+        
+    @property
+    def client(self) -> Optional[Together]:
+        """Together client, created on first use (None without an API key)"""
+        if self._client is None and self.has_api_key:
+            with self._lazy_init_lock:
+                if self._client is None:
+                    self._client = self._create_together_client()
+        return self._client
+    
+    @property
+    def movie_agents(self) -> Dict[str, Any]:
+        """Enabled movie search agents, initialized on first use"""
+        if self._movie_agents is None:
+            with self._lazy_init_lock:
+                if self._movie_agents is None:
+                    self._init_movie_agents()
+        return self._movie_agents
+    
+    def _create_together_client(self) -> Together:
+        """Create the Together client on a pooled keep-alive HTTP client, using HTTP/2 when available"""
+        try:
+            import httpx
+        except ImportError:
+            return Together(api_key=self.api_key)
+        
+        limits = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60)
+        # Fail fast when the API host is unreachable; completions themselves are capped at a few hundred tokens
+        timeout = httpx.Timeout(30.0, connect=5.0)
+        try:
+            http_client = httpx.Client(http2=True, limits=limits, timeout=timeout)
+        except ImportError:
+            # HTTP/2 needs the optional h2 package; keep-alive pooling still applies without it
+            logger.info("h2 not installed, Together client will use HTTP/1.1 keep-alive")
+            http_client = httpx.Client(limits=limits, timeout=timeout)
+        
+        try:
+            return Together(api_key=self.api_key, http_client=http_client)
+        except TypeError:
+            # Older Together SDKs don't accept a custom HTTP client
+            http_client.close()
+            return Together(api_key=self.api_key)
+    
+    def _warmup_client(self):
+        """Send a one-token completion so the connection is ready for the first real request"""
+        try:
+            self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": "hi"}],
+                max_tokens=1
+            )
+            logger.info("Together client warmed up")
+        except Exception as e:
+            logger.debug("Together client warmup failed: %s", e)
+    
+    def _build_intent_messages(self, user_message: str, conversation_context: str = "") -> List[Dict[str, str]]:
+        """Build the intent analysis messages for a user turn"""
+        messages = [{"role": "system", "content": INTENT_SYSTEM_PROMPT}]
+        
+        # Attach recent session context to help handle follow-ups like "yes"/"no".
+        # It goes in its own message so the instructions above stay an identical prefix
+        if conversation_context:
+            messages.append({"role": "system", "content": f"Conversation context (for reference):\n{conversation_context[:1500]}"})
+        
+        messages.append({"role": "user", "content": user_message})
+        return messages
+
+    def _parse_json_object(self, response_text: str) -> Optional[Dict[str, Any]]:
+        """Parse a JSON object from an LLM reply, tolerating surrounding text and code fences"""
+        candidate = _extract_json_object(response_text)
+        if candidate is None:
+            return None
+        try:
+            return _json_loads(candidate)
+        except json.JSONDecodeError:
+            return None
+
+    def analyze_user_intent(self, user_message: str, conversation_context: str = "") -> Dict[str, Any]:
+        """Analyze user intent to determine response type"""
+        # If no API key, use fallback analysis
+        if not self.has_api_key or self._too_short_for_llm(user_message):
+            return self._fallback_intent_analysis(user_message)
+        
+        # The same message in the same context, up to case and punctuation, reuses the earlier analysis
+        cache_key = (_message_key(user_message), conversation_context[:1500])
+        cached = self._intent_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Using cached intent analysis")
+            return cached
+        
+        try:
+            messages = self._build_intent_messages(user_message, conversation_context)
             
             # Validate parameters before API call
             if not self.model or not isinstance(self.model, str):
-                logger.error(f"Invalid model for intent analysis: {self.model}")
+                logger.error("Invalid model for intent analysis: %s", self.model)
                 return self._fallback_intent_analysis(user_message)
             
             if not messages or len(messages) == 0:
@@ -167,52 +919,155 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
             )
             
             response_text = response.choices[0].message.content
-            logger.debug(f"LLM response: {response_text}")
+            logger.debug("LLM response: %s", response_text)
             
-            # Try to parse JSON response with multiple strategies
-            try:
-                # Strategy 1: Try to parse the entire response as JSON
-                intent = json.loads(response_text.strip())
-                logger.info(f"Analyzed intent (full parse): {intent}")
+            intent = self._parse_json_object(response_text)
+            if isinstance(intent, dict):
+                logger.info("Analyzed intent: %s", intent)
+                self._intent_cache.set(cache_key, intent)
                 return intent
-            except json.JSONDecodeError:
-                pass
-            
-            try:
-                # Strategy 2: Extract JSON from response using regex
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    intent = json.loads(json_match.group())
-                    logger.info(f"Analyzed intent (regex parse): {intent}")
-                    return intent
-            except json.JSONDecodeError:
-                pass
-            
-            try:
-                # Strategy 3: Look for JSON between code blocks
-                code_block_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
-                if code_block_match:
-                    intent = json.loads(code_block_match.group(1))
-                    logger.info(f"Analyzed intent (code block parse): {intent}")
-                    return intent
-            except json.JSONDecodeError:
-                pass
             
             # If all parsing strategies fail, log the response and use fallback
-            logger.warning(f"Could not parse LLM response as JSON. Response was: {response_text[:500]}...")
+            logger.warning("Could not parse LLM response as JSON. Response was: %s...", response_text[:500])
             return self._fallback_intent_analysis(user_message)
                 
         except Exception as e:
-            logger.error(f"Error analyzing user intent: {str(e)}")
+            logger.error("Error analyzing user intent: %s", e)
             return self._fallback_intent_analysis(user_message)
     
+    def _analyze_and_respond(self, user_message: str, conversation_context: str = "") -> Optional[Dict[str, Any]]:
+        """Analyze intent and draft the reply in one completion for conversational messages"""
+        if self._too_short_for_llm(user_message):
+            return None
+        
+        try:
+            messages = self._build_intent_messages(user_message, conversation_context)
+            messages.insert(1, {"role": "system", "content": f"{self._persona_header}\n\n{CONVERSATIONAL_RESPONSE_FORMAT}"})
+            
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.5,
+                response_format={"type": "json_object"}
+            )
+            
+            intent = self._parse_json_object(response.choices[0].message.content)
+            if isinstance(intent, dict) and intent.get("intent_type"):
+                logger.info("Analyzed intent (with response): %s", intent.get('intent_type'))
+                return intent
+            
+        except Exception as e:
+            logger.warning("Combined intent and response call failed: %s", e)
+        
+        return None
+    
+    def submit_intent_batch(self, user_messages: List[str]) -> Optional[str]:
+        """Queue intent analyses for many messages on the Together Batch API, for offline cache warm-up.
+        Batches cost half as much and don't compete with chat traffic, but can take hours; returns the batch id.
+        If no batch could be created, the messages are analyzed one by one instead and None is returned.
+        """
+        if not self.has_api_key or not user_messages:
+            return None
+        
+        fd, path = tempfile.mkstemp(suffix='.jsonl')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for i, user_message in enumerate(user_messages):
+                    f.write(_json_dumps({
+                        "custom_id": str(i),
+                        "body": {
+                            "model": self.model,
+                            "messages": self._build_intent_messages(user_message),
+                            "temperature": 0.3,
+                            "max_tokens": 500
+                        }
+                    }) + b"\n")
+            
+            uploaded = self.client.files.upload(path, purpose="batch-api")
+            batch = self.client.batches.create(input_file_id=uploaded.id, endpoint="/v1/chat/completions")
+            
+        except Exception as e:
+            logger.error("Error submitting intent batch: %s", e)
+            self._analyze_intents_directly(user_messages)
+            return None
+        finally:
+            os.remove(path)
+        
+        # The SDK types the created job as optional
+        job = batch.job
+        if job is None or not job.id:
+            logger.error("Intent batch was not created: %s", batch.warning)
+            self._analyze_intents_directly(user_messages)
+            return None
+        
+        self._intent_batches[job.id] = list(user_messages)
+        logger.info("Submitted intent batch %s with %s messages", job.id, len(user_messages))
+        return job.id
+    
+    def _analyze_intents_directly(self, user_messages: List[str]):
+        """Warm the intent cache with one regular analysis per message, when a batch can't be used"""
+        logger.info("Analyzing %s intents one by one instead", len(user_messages))
+        for user_message in user_messages:
+            self.analyze_user_intent(user_message)
+    
+    def collect_intent_batch(self, batch_id: str) -> Optional[int]:
+        """Load the results of a finished intent batch into the intent cache.
+        Returns how many analyses were cached, or None while the batch is still running.
+        """
+        user_messages = self._intent_batches.get(batch_id)
+        if user_messages is None:
+            logger.warning("Unknown intent batch: %s", batch_id)
+            return 0
+        
+        try:
+            job = self.client.batches.retrieve(batch_id)
+            if job.status in ("VALIDATING", "IN_PROGRESS"):
+                return None
+            
+            if job.status != "COMPLETED" or not job.output_file_id:
+                logger.warning("Intent batch %s ended with status %s: %s", batch_id, job.status, job.error)
+                del self._intent_batches[batch_id]
+                return 0
+            
+            lines = list(self.client.files.content(job.output_file_id).iter_lines())
+            
+        except Exception as e:
+            logger.error("Error collecting intent batch %s: %s", batch_id, e)
+            return 0
+        
+        del self._intent_batches[batch_id]
+        cached = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                result = _json_loads(line)
+                user_message = user_messages[int(result["custom_id"])]
+                content = result["response"]["body"]["choices"][0]["message"]["content"]
+            except (ValueError, KeyError, IndexError, TypeError):
+                continue
+            
+            # Keyed like analyze_user_intent without conversation context
+            intent = self._parse_json_object(content)
+            if isinstance(intent, dict):
+                self._intent_cache.set((_message_key(user_message), ""), intent)
+                cached += 1
+        
+        logger.info("Cached %s intent analyses from batch %s", cached, batch_id)
+        return cached
+    
     def _fallback_intent_analysis(self, user_message: str) -> Dict[str, Any]:
         """Enhanced fallback method for intent analysis when LLM fails"""
         message_lower = user_message.lower()
         
+        # Find every fallback keyword in one pass, then check categories against the hits
+        hits = self._keyword_matcher.find(message_lower)
+        
+        def has_any(category: str) -> bool:
+            return not hits.isdisjoint(_FALLBACK_KEYWORD_SETS[category])
+        
         # Check for date/time questions
-        date_time_keywords = ['date', 'time', 'today', 'now', 'current', 'what day', 'what time', 'clock', 'calendar']
-        if any(keyword in message_lower for keyword in date_time_keywords):
+        if has_any("date_time"):
             return {
                 "intent_type": "date_time",
                 "confidence": 0.9,
@@ -221,12 +1076,9 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
             }
         
         # Check for general information requests
-        info_keywords = ['what is', 'what are', 'how does', 'explain', 'define', 'meaning', 'why', 'where', 'when']
-        question_indicators = ['?', 'what', 'how', 'why', 'where', 'when', 'who']
-        if (any(keyword in message_lower for keyword in info_keywords) or 
-            any(indicator in message_lower for indicator in question_indicators)):
+        if has_any("info_or_question"):
             # But exclude movie and personal questions
-            if not any(word in message_lower for word in ['movie', 'film', 'how are you', 'who are you']):
+            if not has_any("info_exclude"):
                 return {
                     "intent_type": "information_request",
                     "confidence": 0.8,
@@ -235,8 +1087,7 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
                 }
         
         # Check for greetings
-        greetings = ['hello', 'hi', 'hey', 'good morning', 'good evening', 'good afternoon']
-        if any(greeting in message_lower for greeting in greetings):
+        if has_any("greeting"):
             return {
                 "intent_type": "greeting",
                 "confidence": 0.8,
@@ -245,8 +1096,7 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
             }
         
         # Check for personal questions
-        personal_keywords = ['how are you', 'what are you', 'who are you', 'tell me about yourself', 'feeling', 'mood']
-        if any(keyword in message_lower for keyword in personal_keywords):
+        if has_any("personal"):
             return {
                 "intent_type": "personal",
                 "confidence": 0.7,
@@ -260,45 +1110,40 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
             return specific_movies
         
         # Enhanced movie keyword detection for general requests
-        movie_keywords = ['movie', 'film', 'watch', 'download', 'stream', 'cinema', 'bollywood', 'hollywood', 'show', 'series']
-        mood_keywords = ['exciting', 'funny', 'romantic', 'scary', 'thrilling', 'action-packed', 'laugh', 'cry']
-        theme_keywords = ['superhero', 'space', 'war', 'family', 'crime', 'zombie', 'vampire', 'magic', 'marvel', 'dc', 'disney']
-        franchise_keywords = ['marvel', 'dc', 'disney', 'pixar', 'star wars', 'harry potter', 'fast and furious', 'john wick']
-        
-        if any(keyword in message_lower for keyword in movie_keywords + mood_keywords + theme_keywords + franchise_keywords):
-            # Extract detailed movie preferences
-            genres = [genre for genre in self.movie_genres if genre in message_lower]
-            years = re.findall(r'\b(19|20)\d{2}\b', user_message)
-            themes = [theme for theme in theme_keywords if theme in message_lower]
-            franchises = [franchise for franchise in franchise_keywords if franchise in message_lower]
+        if has_any("movie_related"):
+            # Extract detailed movie preferences, keeping keyword order for the query
+            genres = [genre for genre in MOVIE_GENRES if genre in hits] if has_any("genre") else []
+            years = _YEAR_RE.findall(user_message)
+            themes = [theme for theme in FALLBACK_INTENT_KEYWORDS["theme"] if theme in hits]
+            franchises = [franchise for franchise in FALLBACK_INTENT_KEYWORDS["franchise"] if franchise in hits]
             
             # Detect mood from keywords
             mood = "any"
-            if any(word in message_lower for word in ['exciting', 'action-packed', 'thrilling']):
+            if has_any("mood_exciting"):
                 mood = "exciting"
                 if 'action' not in genres:
                     genres.append('action')
-            elif any(word in message_lower for word in ['funny', 'laugh', 'comedy']):
+            elif has_any("mood_funny"):
                 mood = "funny"
                 if 'comedy' not in genres:
                     genres.append('comedy')
-            elif any(word in message_lower for word in ['romantic', 'romance', 'love']):
+            elif has_any("mood_romantic"):
                 mood = "romantic"
                 if 'romance' not in genres:
                     genres.append('romance')
-            elif any(word in message_lower for word in ['scary', 'horror', 'fear']):
+            elif has_any("mood_scary"):
                 mood = "scary"
                 if 'horror' not in genres:
                     genres.append('horror')
             
             # Detect language preferences
             language = "any"
-            if any(word in message_lower for word in ['hindi', 'bollywood']):
+            if has_any("language_hindi"):
                 language = "hindi"
-            elif any(word in message_lower for word in ['english', 'hollywood']):
+            elif has_any("language_english"):
                 language = "english"
-            elif any(word in message_lower for word in ['tamil', 'telugu', 'malayalam']):
-                language = next(word for word in ['tamil', 'telugu', 'malayalam'] if word in message_lower)
+            elif has_any("language_regional"):
+                language = next(word for word in FALLBACK_INTENT_KEYWORDS["language_regional"] if word in hits)
             
             # Build intelligent search query
             search_parts = []
@@ -308,10 +1153,9 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
                 # For Marvel, DC, etc., use the franchise name as primary search term
                 search_parts.extend(franchises[:1])
                 # Add specific recent years if "latest", "new", or "recent" is mentioned
-                if 'latest' in message_lower or 'new' in message_lower or 'recent' in message_lower:
+                if has_any("latest"):
                     # Add current year and previous year for truly latest movies
-                    from datetime import datetime
-                    current_year = datetime.now().year
+                    current_year = _current_year()
                     search_parts.extend([str(current_year), str(current_year - 1)])  # 2025, 2024
             
             if language != "any":
@@ -356,134 +1200,32 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
     
     def _detect_specific_movie(self, user_message: str) -> Optional[Dict[str, Any]]:
         """Detect and research specific movie requests in fallback mode"""
-        import difflib
-        
-        message_lower = user_message.lower().strip()
-        
-        # Known movie database (fallback when LLM API fails)
-        known_movies = {
-            "rrr": {
-                "full_title": "RRR",
-                "release_year": "2022",
-                "alternate_names": ["RRR (Rise Roar Revolt)", "Roudram Ranam Rudhiram"],
-                "key_details": "Telugu epic action film by S.S. Rajamouli starring Ram Charan and Jr. NTR",
-                "language": "telugu",
-                "genres": ["action", "drama"],
-                "search_variations": ["RRR", "RRR 2022", "RRR movie", "RRR telugu"]
-            },
-            "avatar": {
-                "full_title": "Avatar",
-                "release_year": "2009",
-                "alternate_names": ["Avatar: The Way of Water (2022 sequel)"],
-                "key_details": "James Cameron sci-fi film starring Sam Worthington",
-                "language": "english",
-                "genres": ["sci-fi", "action"],
-                "search_variations": ["Avatar", "Avatar 2009", "Avatar James Cameron"]
-            },
-            "john wick": {
-                "full_title": "John Wick",
-                "release_year": "2014",
-                "alternate_names": ["John Wick Chapter series"],
-                "key_details": "Action thriller starring Keanu Reeves",
-                "language": "english",
-                "genres": ["action", "thriller"],
-                "search_variations": ["John Wick", "John Wick 2014", "John Wick movie"]
-            },
-            "avengers endgame": {
-                "full_title": "Avengers: Endgame",
-                "release_year": "2019",
-                "alternate_names": ["Endgame"],
-                "key_details": "Marvel superhero film, final Infinity Saga movie",
-                "language": "english",
-                "genres": ["action", "adventure"],
-                "search_variations": ["Avengers Endgame", "Avengers: Endgame", "Endgame"]
-            },
-            "kgf": {
-                "full_title": "K.G.F: Chapter 1",
-                "release_year": "2018",
-                "alternate_names": ["KGF", "K.G.F Chapter 2 (2022)"],
-                "key_details": "Kannada action film starring Yash",
-                "language": "kannada",
-                "genres": ["action", "drama"],
-                "search_variations": ["KGF", "K.G.F", "KGF Chapter 1"]
+        movie_key = _match_known_movie(user_message.lower().strip())
+        return self._known_movie_intent(movie_key) if movie_key else None
+    
+    def _known_movie_intent(self, movie_key: str) -> Dict[str, Any]:
+        """Build a specific-movie intent from a KNOWN_MOVIES entry"""
+        # Copy so callers can adjust the intent without touching the shared table
+        movie_data = copy.deepcopy(KNOWN_MOVIES[movie_key])
+        return {
+            "intent_type": "movie_request",
+            "confidence": 0.9,
+            "movie_details": {
+                "movie_titles": [movie_data["full_title"]],
+                "genres": movie_data["genres"],
+                "years": [movie_data["release_year"]],
+                "language": movie_data["language"],
+                "movie_research": movie_data,
+                "search_query": f"{movie_data['full_title']} {movie_data['release_year']}",
+                "search_variations": movie_data["search_variations"]
             },
-            "pushpa": {
-                "full_title": "Pushpa: The Rise",
-                "release_year": "2021",
-                "alternate_names": ["Pushpa Part 1"],
-                "key_details": "Telugu action drama starring Allu Arjun",
-                "language": "telugu",
-                "genres": ["action", "drama"],
-                "search_variations": ["Pushpa", "Pushpa The Rise", "Pushpa movie"]
+            "user_intent_analysis": {
+                "what_they_want": f"the specific movie {movie_data['full_title']} ({movie_data['release_year']})",
+                "is_specific_movie": True,
+                "confidence_in_movie_match": "high"
             },
-            "mahavatar narsimha": {
-                "full_title": "Mahavatar Narsimha",
-                "release_year": "2000",
-                "alternate_names": ["Mahavatar Narasimha", "Narsimha Avatar"],
-                "key_details": "Telugu mythological film starring Nandamuri Balakrishna, directed by B. Gopal",
-                "language": "telugu",
-                "genres": ["mythology", "drama"],
-                "search_variations": ["Mahavatar Narsimha", "Mahavatar Narasimha", "Narsimha", "Mahavatar Narsimha 2000"]
-            }
+            "response_style": "informative"
         }
-        
-        # Enhanced matching code using difflib
-        known_titles = list(known_movies.keys())
-        close = difflib.get_close_matches(message_lower, known_titles, n=1, cutoff=0.6)
-        if close:
-            movie_key = close[0]
-            movie_data = known_movies[movie_key]
-            
-            return {
-                "intent_type": "movie_request",
-                "confidence": 0.9,
-                "movie_details": {
-                    "movie_titles": [movie_data["full_title"]],
-                    "genres": movie_data["genres"],
-                    "years": [movie_data["release_year"]],
-                    "language": movie_data["language"],
-                    "movie_research": movie_data,
-                    "search_query": f"{movie_data['full_title']} {movie_data['release_year']}",
-                    "search_variations": movie_data["search_variations"]
-                },
-                "user_intent_analysis": {
-                    "what_they_want": f"the specific movie {movie_data['full_title']} ({movie_data['release_year']})",
-                    "is_specific_movie": True,
-                    "confidence_in_movie_match": "high"
-                },
-                "response_style": "informative"
-            }
-        
-        # Clean the message for matching
-        clean_message = re.sub(r'\b(movie|film|watch|download)\b', '', message_lower).strip()
-        
-        # Check for exact matches or close matches
-        for movie_key, movie_data in known_movies.items():
-            if (movie_key in clean_message or 
-                clean_message in movie_key or
-                any(alt.lower() in clean_message for alt in movie_data["alternate_names"])):
-                
-                return {
-                    "intent_type": "movie_request",
-                    "confidence": 0.9,
-                    "movie_details": {
-                        "movie_titles": [movie_data["full_title"]],
-                        "genres": movie_data["genres"],
-                        "years": [movie_data["release_year"]],
-                        "language": movie_data["language"],
-                        "movie_research": movie_data,
-                        "search_query": f"{movie_data['full_title']} {movie_data['release_year']}",
-                        "search_variations": movie_data["search_variations"]
-                    },
-                    "user_intent_analysis": {
-                        "what_they_want": f"the specific movie {movie_data['full_title']} ({movie_data['release_year']})",
-                        "is_specific_movie": True,
-                        "confidence_in_movie_match": "high"
-                    },
-                    "response_style": "informative"
-                }
-        
-        return None
     
     def _build_search_variations(self, search_query: str, franchises: List[str], message_lower: str) -> List[str]:
         """Build multiple search variations for better movie finding, especially for latest requests"""
@@ -495,8 +1237,7 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
             
             # For latest requests, create year-specific variations
             if 'latest' in message_lower or 'new' in message_lower or 'recent' in message_lower:
-                from datetime import datetime
-                current_year = datetime.now().year
+                current_year = _current_year()
                 
                 # Add variations with specific years
                 variations.extend([
@@ -509,15 +1250,7 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
                     f"recent {franchise} movies"
                 ])
         
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_variations = []
-        for var in variations:
-            if var not in seen:
-                seen.add(var)
-                unique_variations.append(var)
-        
-        return unique_variations
+        return list(dict.fromkeys(variations))  # Remove duplicates while preserving order
     
     def _looks_like_movie_title(self, text: str) -> bool:
         """Heuristic to decide if a short user input likely refers to a movie title.
@@ -526,20 +1259,18 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
         if not text:
             return False
         t = text.strip()
-        # Must contain letters
-        if not re.search(r"[A-Za-z]", t):
-            return False
         # Too long sentences are unlikely to be titles
         if len(t) > 60:
             return False
+        # Must contain letters
+        if not any(c.isalpha() for c in t):
+            return False
         # Token-based checks
-        tokens = re.split(r"\s+", t)
-        if len(tokens) > 6:
+        if len(t.split()) > 6:
             return False
         # Avoid typical greeting/personal starters
         lowered = t.lower()
-        bad_starts = ("hello", "hi ", "hey ", "how are", "what is", "who are", "i want", "i need", "suggest")
-        if any(lowered.startswith(bs) for bs in bad_starts):
+        if lowered.startswith(_BAD_TITLE_STARTS):
             return False
         # Avoid sentences ending with question mark (likely not just a title)
         if lowered.endswith('?'):
@@ -558,16 +1289,17 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
             
             # Get only enabled agents from the agent manager
             enabled_agents = self.agent_manager.get_enabled_agents()
-            self.movie_agents = enabled_agents
+            self._movie_agents = enabled_agents
             
-            logger.info(f"Initialized {len(self.movie_agents)} enabled movie search agents: {list(self.movie_agents.keys())}")
+            logger.info("Initialized %s enabled movie search agents: %s", len(enabled_agents), list(enabled_agents.keys()))
             
-            if not self.movie_agents:
+            if not enabled_agents:
                 logger.warning("No movie agents are enabled! Please enable at least one agent in the admin panel.")
             
         except Exception as e:
-            logger.error(f"Failed to initialize movie agents through AgentManager: {e}")
+            logger.error("Failed to initialize movie agents through AgentManager: %s", e)
             # Fallback to manual initialization (old behavior) if AgentManager fails
+            self._movie_agents = {}
             self._init_movie_agents_fallback()
     
     def _init_movie_agents_fallback(self):
@@ -575,31 +1307,34 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
         logger.warning("Using fallback agent initialization - agents may not respect enabled/disabled settings")
         try:
             from agents.movierulz_agent import MovieRulzAgent
-            self.movie_agents['movierulz'] = MovieRulzAgent()
+            self._movie_agents['movierulz'] = MovieRulzAgent()
             logger.info("MovieRulz agent initialized (fallback)")
         except Exception as e:
-            logger.error(f"Failed to initialize MovieRulz agent: {e}")
+            logger.error("Failed to initialize MovieRulz agent: %s", e)
         
         try:
             from agents.moviezwap_agent import MoviezWapAgent
-            self.movie_agents['moviezwap'] = MoviezWapAgent()
+            self._movie_agents['moviezwap'] = MoviezWapAgent()
             logger.info("MoviezWap agent initialized (fallback)")
         except Exception as e:
-            logger.error(f"Failed to initialize MoviezWap agent: {e}")
+            logger.error("Failed to initialize MoviezWap agent: %s", e)
         
         try:
             from agents.enhanced_downloadhub_agent import EnhancedDownloadHubAgent
-            self.movie_agents['downloadhub'] = EnhancedDownloadHubAgent()
+            self._movie_agents['downloadhub'] = EnhancedDownloadHubAgent()
             logger.info("DownloadHub agent initialized (fallback)")
         except Exception as e:
-            logger.error(f"Failed to initialize DownloadHub agent: {e}")
+            logger.error("Failed to initialize DownloadHub agent: %s", e)
         
-        logger.info(f"Fallback initialization completed: {len(self.movie_agents)} agents: {list(self.movie_agents.keys())}")
+        logger.info("Fallback initialization completed: %s agents: %s", len(self._movie_agents), list(self._movie_agents.keys()))
     
     def refresh_agents(self):
         """Refresh movie agents based on current configuration"""
         logger.info("Refreshing movie agents based on current configuration...")
         self._init_movie_agents()
+        # Cached results may come from agents that are now disabled
+        self._search_cache.clear()
+        self._agent_search_cache.clear()
     
     def get_enabled_agent_names(self) -> List[str]:
         """Get list of currently enabled agent names"""
@@ -610,11 +1345,23 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
             return [agent_name.title() + " Agent" for agent_name in self.movie_agents.keys()]
     
     def _search_via_api_endpoint(self, search_query: str) -> Dict[str, Any]:
+        """Search for movies using the /search endpoint, reusing recent results for the same query"""
+        # Key on the loaded agent set too, without forcing agents to load just for a lookup
+        cache_key = (_normalize_query(search_query), tuple(sorted(self._movie_agents or ())))
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Using cached search results for: %s", search_query)
+            return cached
+        
+        results = self._fetch_search_results(search_query)
+        # Empty results may be a transient failure, so only keep hits
+        if results.get("movies"):
+            self._search_cache.set(cache_key, results)
+        return results
+    
+    def _fetch_search_results(self, search_query: str) -> Dict[str, Any]:
         """Search for movies using the actual /search endpoint via HTTP request"""
         try:
-            import requests
-            import os
-            
             # Try to determine the correct base URL
             base_urls = [
                 "http://127.0.0.1:5000",  # Default Flask dev server
@@ -629,45 +1376,41 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
                 base_urls.insert(0, f"http://127.0.0.1:{port}")
                 base_urls.insert(1, f"http://localhost:{port}")
             
-            search_data = {
+            # Serialize the request body once for every base URL tried
+            payload = _json_dumps({
                 'movie_name': search_query,
                 'page': 1
-            }
-            
-            headers = {'Content-Type': 'application/json'}
+            })
             
-            # Try each base URL until one works
-            for base_url in base_urls:
+            # Try the last working base URL, then each reachable one, until one works
+            for base_url in self._candidate_base_urls(base_urls):
                 try:
-                    logger.info(f"Trying to search via {base_url}/search")
-                    response = requests.post(
+                    logger.info("Trying to search via %s/search", base_url)
+                    response = self._http.post(
                         f"{base_url}/search",
-                        json=search_data,
-                        headers=headers,
-                        timeout=30
+                        data=payload,
+                        timeout=SEARCH_ENDPOINT_TIMEOUT
                     )
                     
                     if response.status_code == 200:
-                        data = response.json()
+                        self._last_good_base_url = base_url
+                        data = _json_loads(response.content)
                         if data.get('success'):
                             movies = data.get('results', [])
-                            logger.info(f"Found {len(movies)} movies via /search endpoint at {base_url}")
+                            logger.info("Found %s movies via /search endpoint at %s", len(movies), base_url)
                             return {"movies": movies}
                         else:
-                            logger.warning(f"Search endpoint returned error: {data.get('error', 'Unknown error')}")
+                            logger.warning("Search endpoint returned error: %s", data.get('error', 'Unknown error'))
                             return {"movies": []}
                     else:
-                        logger.debug(f"Search endpoint at {base_url} returned status {response.status_code}")
+                        logger.debug("Search endpoint at %s returned status %s", base_url, response.status_code)
                         continue
                         
-                except requests.exceptions.ConnectionError:
-                    logger.debug(f"Could not connect to {base_url}")
-                    continue
-                except requests.exceptions.Timeout:
-                    logger.debug(f"Timeout connecting to {base_url}")
-                    continue
-                except Exception as e:
-                    logger.debug(f"Error with {base_url}: {e}")
+                except requests.exceptions.RequestException as e:
+                    logger.debug("Error with %s: %s", base_url, e)
+                    # A failed request means the remembered URL has to be probed again
+                    if base_url == self._last_good_base_url:
+                        self._last_good_base_url = None
                     continue
             
             # If all HTTP attempts failed, fall back to direct search
@@ -675,10 +1418,41 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
             return self._fallback_direct_search(search_query)
                 
         except Exception as e:
-            logger.error(f"Error in _search_via_api_endpoint: {e}")
+            logger.error("Error in _search_via_api_endpoint: %s", e)
             # Fallback to direct agent search
             return self._fallback_direct_search(search_query)
     
+    def _candidate_base_urls(self, base_urls: List[str]) -> Iterator[str]:
+        """Yield the last working base URL first; probe the others only if it is needed"""
+        last_good = self._last_good_base_url
+        if last_good in base_urls:
+            yield last_good
+        yield from self._reachable_base_urls([base_url for base_url in base_urls if base_url != last_good])
+    
+    def _reachable_base_urls(self, base_urls: List[str]) -> Iterator[str]:
+        """Probe all base URLs concurrently and yield each one as soon as it accepts a connection"""
+        def probe(base_url: str) -> bool:
+            parts = urlsplit(base_url)
+            try:
+                with socket.create_connection((parts.hostname, parts.port or 80), timeout=2):
+                    return True
+            except OSError:
+                logger.debug("Could not connect to %s", base_url)
+                return False
+        
+        if not base_urls:
+            return
+        
+        # Don't wait for slow probes once a live server has answered
+        executor = ThreadPoolExecutor(max_workers=len(base_urls))
+        try:
+            futures = {executor.submit(probe, base_url): base_url for base_url in base_urls}
+            for future in as_completed(futures):
+                if future.result():
+                    yield futures[future]
+        finally:
+            executor.shutdown(wait=False)
+    
     def _fallback_direct_search(self, search_query: str) -> Dict[str, Any]:
         """Fallback method to search directly using agents if /search endpoint is not available"""
         try:
@@ -691,7 +1465,7 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
             # Search using available agents (simplified version)
             for agent_name, agent in list(self.movie_agents.items())[:2]:  # Use only first 2 agents for speed
                 try:
-                    logger.info(f"Fallback search using {agent_name} for: {search_query}")
+                    logger.info("Fallback search using %s for: %s", agent_name, search_query)
                     result = agent.search_movies(search_query)
                     if result and result.get('movies'):
                         movies = result['movies']
@@ -700,17 +1474,17 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
                             movie['source'] = agent_name.title()
                         all_results.extend(movies[:10])  # Limit to 10 per source
                 except Exception as e:
-                    logger.error(f"Error in fallback search with {agent_name}: {e}")
+                    logger.error("Error in fallback search with %s: %s", agent_name, e)
                     continue
             
-            # Remove duplicates
-            unique_movies = self._remove_duplicate_movies(all_results)
-            logger.info(f"Fallback search found {len(unique_movies)} unique movies")
+            # Remove duplicates, stopping at the 20 movies returned
+            unique_movies = self._remove_duplicate_movies(all_results, limit=20)
+            logger.info("Fallback search found %s unique movies", len(unique_movies))
             
-            return {"movies": unique_movies[:20]}  # Limit to 20 total
+            return {"movies": [_public_movie(movie) for movie in unique_movies]}
             
         except Exception as e:
-            logger.error(f"Error in fallback search: {e}")
+            logger.error("Error in fallback search: %s", e)
             return {"movies": []}
 
     def search_movies_with_sources(self, search_query: str, search_variations: List[str] = None) -> Dict[str, Any]:
@@ -737,91 +1511,114 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
             "search_queries_used": search_variations
         }
         
-        # Search across all agents with timeout, trying multiple variations
-        with ThreadPoolExecutor(max_workers=len(self.movie_agents) * min(3, len(search_variations))) as executor:
-            future_to_agent = {}
-            
-            for agent_name, agent in self.movie_agents.items():
-                # Try multiple search variations for better results
-                variations_to_try = search_variations[:3]  # Try top 3 variations
-                for i, query in enumerate(variations_to_try):
-                    future = executor.submit(self._safe_search, agent, agent_name, query)
-                    future_to_agent[future] = (agent_name, query, i)
+        # Search across all agents with timeout, trying multiple variations, on the shared search pool
+        future_to_agent = {}
+        
+        # Try multiple search variations for better results
+        variations_to_try = search_variations[:3]  # Try top 3 variations
+        for agent_name, agent in self.movie_agents.items():
+            for i, query in enumerate(variations_to_try):
+                future = _SEARCH_POOL.submit(self._safe_search, agent, agent_name, query)
+                future_to_agent[future] = (agent_name, query, i)
+        
+        # Collect results with timeout - use try-catch for each future
+        seen_titles = set()
+        # Insertion-ordered sets of summary entries, turned into lists at the end
+        successful_sources = {}
+        sources_searched = {}
+        # Harvest searches as they finish until everything is done, the 90 second
+        # deadline passes, or enough distinct movies are in
+        pending = set(future_to_agent)
+        deadline = time.monotonic() + 90
+        while pending and len(seen_titles) < SEARCH_ENOUGH_RESULTS:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                logger.warning("Overall search timeout reached with %s searches still running", len(pending))
+                break
+            
+            for future in done:
+                agent_name, query, variation_index = future_to_agent[future]
+                try:
+                    result = future.result()
+                    if result and result.get('movies'):
+                        all_results.extend(result['movies'])
+                        seen_titles.update(map(_title_key, result['movies']))
+                        successful_sources[f"{agent_name} (query: '{query}')"] = None
+                        logger.info("Found %s movies from %s using query: '%s'", len(result['movies']), agent_name, query)
+                    
+                    sources_searched[f"{agent_name} (variation {variation_index + 1})"] = None
+                    
+                except Exception as e:
+                    logger.error("Error searching %s with query '%s': %s", agent_name, query, e)
+                    sources_searched[f"{agent_name} ('{query}') - FAILED: {str(e)}"] = None
             
-            # Collect results with timeout - use try-catch for each future
-            try:
-                for future in as_completed(future_to_agent, timeout=90):  # Increased total timeout to 90 seconds
-                    agent_name, query, variation_index = future_to_agent[future]
-                    try:
-                        result = future.result(timeout=45)  # Increased per agent timeout to 45 seconds
-                        if result and result.get('movies'):
-                            all_results.extend(result['movies'])
-                            source_info = f"{agent_name} (query: '{query}')"
-                            if source_info not in search_summary["successful_sources"]:
-                                search_summary["successful_sources"].append(source_info)
-                            logger.info(f"Found {len(result['movies'])} movies from {agent_name} using query: '{query}'")
-                        
-                        search_info = f"{agent_name} (variation {variation_index + 1})"
-                        if search_info not in search_summary["sources_searched"]:
-                            search_summary["sources_searched"].append(search_info)
-                        
-                    except Exception as e:
-                        logger.error(f"Error searching {agent_name} with query '{query}': {str(e)}")
-                        error_info = f"{agent_name} ('{query}') - FAILED: {str(e)}"
-                        if error_info not in search_summary["sources_searched"]:
-                            search_summary["sources_searched"].append(error_info)
-            except Exception as timeout_error:
-                logger.warning(f"Overall search timeout reached: {str(timeout_error)}")
-                # Continue with whatever results we have so far
-        
-        # Remove duplicates and sort
+            seen_titles.discard('')
+        
+        # Drop searches still queued; ones already running finish in the background
+        if pending:
+            cancelled = sum(f.cancel() for f in pending)
+            logger.info("Collected %s unique movies, cancelled %s pending searches", len(seen_titles), cancelled)
+        
+        # Remove duplicates and pick the top 20 results
         unique_movies = self._remove_duplicate_movies(all_results)
-        sorted_movies = self._sort_by_relevance(unique_movies, search_query)
+        top_movies = self._sort_by_relevance(unique_movies, search_query, limit=20)
         
-        search_summary["total_movies"] = len(sorted_movies)
+        search_summary["total_movies"] = len(unique_movies)
+        search_summary["successful_sources"] = list(successful_sources)
+        search_summary["sources_searched"] = list(sources_searched)
         
         return {
-            "movies": sorted_movies[:20],  # Limit to top 20 results
+            "movies": [_public_movie(movie) for movie in top_movies],
             "search_summary": search_summary,
             "search_query": search_query,
-            "total_found": len(sorted_movies)
+            "total_found": len(unique_movies)
         }
     
     def _safe_search(self, agent, agent_name: str, query: str) -> Optional[Dict[str, Any]]:
         """Safely search using an agent with error handling"""
+        cache_key = (agent_name, _normalize_query(query))
+        cached = self._agent_search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            logger.info(f"Searching {agent_name} for: {query}")
+            logger.info("Searching %s for: %s", agent_name, query)
             result = agent.search_movies(query)
+            if result and result.get('movies'):
+                self._agent_search_cache.set(cache_key, result)
             return result
         except Exception as e:
-            logger.error(f"Error in {agent_name} search: {str(e)}")
+            logger.error("Error in %s search: %s", agent_name, e)
             return None
     
-    def _remove_duplicate_movies(self, movies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate movies based on title similarity"""
+    def _remove_duplicate_movies(self, movies: List[Dict[str, Any]], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Remove duplicate movies based on title similarity, stopping once limit unique movies are found"""
         unique_movies = []
         seen_titles = set()
         
         for movie in movies:
-            title = movie.get('title', '').lower().strip()
-            title_key = re.sub(r'[^\w\s]', '', title)
+            title_key = _strip_punct(_prep_movie(movie)['_title_lc'])
             
-            if title_key not in seen_titles and title_key:
+            if title_key and title_key not in seen_titles:
                 seen_titles.add(title_key)
                 unique_movies.append(movie)
+                if limit is not None and len(unique_movies) >= limit:
+                    break
         
         return unique_movies
     
-    def _sort_by_relevance(self, movies: List[Dict[str, Any]], search_query: str) -> List[Dict[str, Any]]:
-        """Sort movies by relevance to search query"""
+    def _sort_by_relevance(self, movies: List[Dict[str, Any]], search_query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Sort movies by relevance to search query, keeping only the best limit movies if given"""
         if not movies or not search_query:
-            return movies
+            return movies[:limit]
         
         search_lower = search_query.lower()
-        is_latest_request = any(word in search_lower for word in ['latest', 'new', 'recent', '2024', '2025'])
+        current_year = _current_year()
+        latest_words = ('latest', 'new', 'recent', str(current_year - 1), str(current_year))
+        is_latest_request = any(word in search_lower for word in latest_words)
         
         def relevance_score(movie):
-            title = movie.get('title', '').lower()
+            title = _prep_movie(movie)['_title_lc']
             year = str(movie.get('year', ''))
             
             score = 0
@@ -829,20 +1626,8 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
             # For "latest" requests, heavily prioritize recent years
             if is_latest_request and year:
                 try:
-                    movie_year = int(year)
-                    current_year = 2025  # Current year
-                    year_diff = current_year - movie_year
-                    
-                    if year_diff <= 1:  # 2024-2025
-                        score += 200  # Highest priority for very recent
-                    elif year_diff <= 2:  # 2023
-                        score += 150
-                    elif year_diff <= 3:  # 2022
-                        score += 100
-                    elif year_diff <= 5:  # 2020-2021
-                        score += 50
-                    else:  # Older than 2020
-                        score += 10  # Much lower priority for old movies
+                    year_diff = current_year - int(year)
+                    score += next((bonus for max_diff, bonus in _RECENCY_BONUS if year_diff <= max_diff), 10)
                 except ValueError:
                     pass
             
@@ -863,10 +1648,7 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
                 score += 20
             
             # Quality bonus (higher quality = higher score)
-            quality = movie.get('quality', '')
-            if isinstance(quality, list):
-                quality = ' '.join(str(q) for q in quality)
-            quality = str(quality).lower()
+            quality = movie['_quality_lc']
             
             if '1080p' in quality:
                 score += 10
@@ -874,16 +1656,16 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
                 score += 5
             
             # Source reliability bonus
-            source = movie.get('source', '').lower()
-            if 'downloadhub' in source:
-                score += 3
-            elif 'movierulz' in source:
-                score += 2
-            elif 'moviezwap' in source:
-                score += 1
+            source = movie['_source_lc']
+            score += next((bonus for name, bonus in _SOURCE_BONUS if name in source), 0)
             
             return score
         
+        if limit is not None and len(movies) > limit:
+            # Top-k selection; the negated index keeps ties in input order, like the stable sort
+            top = heapq.nlargest(limit, enumerate(movies), key=lambda item: (relevance_score(item[1]), -item[0]))
+            return [movie for _, movie in top]
+        
         return sorted(movies, key=relevance_score, reverse=True)
     
     def process_movie_request(self, user_message: str, session_id: str = None) -> Dict[str, Any]:
@@ -893,25 +1675,39 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
         if session_id:
             conversation_context = session_manager.get_conversation_context(session_id)
         
-        # Analyze user intent with session context
-        intent = self.analyze_user_intent(user_message, conversation_context)
+        # Bare greetings, and confirmations with nothing to confirm, don't need the LLM
+        normalized = user_message.strip().lower()
+        is_affirmation = normalized in AFFIRMATIONS
+        if normalized in CLEAR_GREETINGS:
+            return self._canned_response("greeting", random.choice(CANNED_GREETINGS), session_id)
+        if is_affirmation:
+            ctx = session_manager.get_session(session_id) if session_id else None
+            if not ((ctx or {}).get('movie_context') or {}).get('title'):
+                return self._canned_response("general_chat", AFFIRMATION_CLARIFIER, session_id)
+        
+        # Conversational messages get their intent and reply from a single completion;
+        # anything that may need a search keeps the two-phase path
+        intent = None
+        prepared_response = None
+        if self.has_api_key and self._fallback_intent_analysis(user_message).get('intent_type') in CONVERSATIONAL_INTENTS:
+            intent = self._analyze_and_respond(user_message, conversation_context)
+        
+        if intent:
+            prepared_response = intent.pop('response', None)
+        else:
+            # Analyze user intent with session context
+            intent = self.analyze_user_intent(user_message, conversation_context)
 
         # SMART MOVIE DETECTION: Force movie_request for any movie-related input
         # Users come here to download movies, so be aggressive about detecting movie intent
         normalized_input = user_message.lower().strip()
         
         # Enhanced movie detection patterns
-        movie_indicators = [
-            'download', 'watch', 'movie', 'film', 'latest', 'new', 'release', 'quality',
-            'hindi', 'english', 'tamil', 'telugu', 'bollywood', 'hollywood', '2023', '2024',
-            'mp4', 'mkv', 'hd', '720p', '1080p', '4k'
-        ]
-        
-        contains_movie_indicator = any(indicator in normalized_input for indicator in movie_indicators)
+        contains_movie_indicator = self._indicator_matcher.contains_any(normalized_input)
         looks_like_title = self._looks_like_movie_title(user_message)
         
         # Don't override clear greetings or personal messages
-        is_clear_greeting = normalized_input in ['hello', 'hi', 'hey', 'hlo', 'helo', 'hallo']
+        is_clear_greeting = normalized_input in CLEAR_GREETINGS
         is_clear_personal = any(p in normalized_input for p in ['how are you', 'who are you', 'what are you'])
         
         # If not already a movie request but has movie indicators or looks like title, make it one
@@ -932,6 +1728,10 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
                 'download_focused': True
             }
         
+        # A drafted reply only applies if the turn is still conversational
+        if intent.get('intent_type') not in CONVERSATIONAL_INTENTS or not isinstance(prepared_response, str):
+            prepared_response = None
+        
         response_data = {
             "intent": intent,
             "response_text": "",
@@ -939,12 +1739,6 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
             "search_performed": False,
             "session_id": session_id
         }
-
-        # Heuristic: detect short confirmation responses like "yes", "yeah", "correct",
-        # and, if the previous turn was a specific movie confirmation, reuse last movie context
-        normalized = user_message.strip().lower()
-        is_affirmation = normalized in {"yes","y","yeah","yep","correct","exactly","right","sure","ok","okay"}
-
         
         # MOVIE SEARCH LOGIC: Use the /search endpoint like the /api page
         if intent.get("intent_type") == "movie_request":
@@ -960,7 +1754,7 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
             # If LLM provided movie titles and this is NOT a specific movie request,
             # show selection chips instead of searching immediately
             if movie_titles and len(movie_titles) > 1 and not is_specific_movie:
-                logger.info(f"Showing movie selection chips for: {movie_titles}")
+                logger.info("Showing movie selection chips for: %s", movie_titles)
                 
                 response_data["movies"] = []
                 response_data["search_performed"] = False
@@ -974,7 +1768,7 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
                 if not search_query.strip():
                     search_query = user_message.strip()
                 
-                logger.info(f"Performing movie search using /search endpoint for: {search_query}")
+                logger.info("Performing movie search using /search endpoint for: %s", search_query)
                 
                 # Use the same search endpoint that /api uses
                 search_results = self._search_via_api_endpoint(search_query)
@@ -1004,29 +1798,31 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
                 
                 else:
                     # No movies found
-                    logger.info(f"No movies found for: {search_query}")
+                    logger.info("No movies found for: %s", search_query)
                     
                     response_data["movies"] = []
                     response_data["search_performed"] = True
                     response_data["search_level"] = "NO_RESULTS_FOUND"
                     
-                    # Generate no results response
-                    response_data["response_text"] = self._generate_no_results_response(user_message, intent, search_query)
+                    # Generate no results response, with searches to try instead
+                    no_results = self._generate_no_results_response_with_suggestions(user_message, intent, search_query)
+                    response_data["response_text"] = no_results["response"]
+                    response_data["suggestions"] = no_results["suggestions"]
         else:
             # If user simply confirms (e.g. "yes") and we have a previous movie context, reuse it to search
             if is_affirmation and session_id:
                 ctx = session_manager.get_session(session_id)
                 prev = (ctx or {}).get('movie_context') or {}
                 if prev.get('title'):
-                    logger.info(f"Affirmation detected; reusing movie context: {prev['title']}")
+                    logger.info("Affirmation detected; reusing movie context: %s", prev['title'])
                     search_results = self._search_via_api_endpoint(prev['title'])
                     response_data["movies"] = search_results.get("movies", [])
                     response_data["search_performed"] = True
                     response_data["response_text"] = self._generate_simple_movie_response(user_message, intent, search_results.get("movies", []))
                 else:
                     # If affirmation but no context, fall back to contextual response
-                    response_data["response_text"] = self.generate_contextual_response(user_message, intent)
-            elif (self._looks_like_movie_title(user_message) and 
+                    response_data["response_text"] = prepared_response or self.generate_contextual_response(user_message, intent)
+            elif (looks_like_title and 
                   not is_clear_greeting and not is_clear_personal and
                   intent.get('intent_type') not in ('date_time', 'information_request')):
                 # If the user typed a likely movie title but LLM intent didn't trigger, force a movie search
@@ -1038,10 +1834,20 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
                 response_data["response_text"] = self._generate_simple_movie_response(user_message, intent, search_results.get("movies", []))
             else:
                 # Generate non-movie response
-                response_data["response_text"] = self.generate_contextual_response(user_message, intent)
+                response_data["response_text"] = prepared_response or self.generate_contextual_response(user_message, intent)
         
         return response_data
     
+    def _canned_response(self, intent_type: str, response_text: str, session_id: str = None) -> Dict[str, Any]:
+        """Response data for a turn answered without the LLM or a search"""
+        return {
+            "intent": {"intent_type": intent_type, "confidence": 0.9, "response_style": "conversational"},
+            "response_text": response_text,
+            "movies": [],
+            "search_performed": False,
+            "session_id": session_id
+        }
+    
     def generate_contextual_response(self, user_message: str, intent: Dict[str, Any], search_results: List[Dict] = None) -> str:
         """Generate contextual response based on intent analysis"""
         
@@ -1060,11 +1866,49 @@ REMEMBER: Always populate movie_titles array for any movie recommendation reques
         else:
             return self._generate_general_response(user_message, intent)
     
+    def generate_contextual_response_stream(self, user_message: str, intent: Dict[str, Any], search_results: List[Dict] = None) -> Iterator[str]:
+        """Stream the contextual response as text chunks while the model generates it"""
+        intent_type = intent.get("intent_type", "general_chat")
+        
+        if intent_type == "movie_request":
+            yield from self._generate_movie_response_stream(user_message, intent, search_results)
+        elif intent_type == "general_chat":
+            yield from self._generate_general_response_stream(user_message, intent)
+        elif intent_type == "information_request" and self.has_api_key:
+            yield from self._generate_information_response_stream(user_message, intent)
+        else:
+            # Remaining intents are short or template based, send them in one piece
+            yield self.generate_contextual_response(user_message, intent, search_results)
+    
+    def _stream_completion(self, messages: List[Dict[str, str]], temperature: float,
+                           max_tokens: int = RESPONSE_MAX_TOKENS, stop: Optional[List[str]] = None) -> Iterator[str]:
+        """Yield content deltas from a streamed chat completion"""
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stop=stop,
+            stream=True
+        )
+        
+        for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+    
     def _generate_greeting_response(self, user_message: str, intent: Dict[str, Any]) -> str:
         """Generate friendly greeting response"""
         try:
-            system_prompt = f"""You are {self.agent_personality['name']}, a {self.agent_personality['role']}. 
-You are {', '.join(self.agent_personality['traits'])}.
+            # Greetings repeat across users, so reuse a recent reply to an equivalent message
+            cache_key = ("greeting", _message_key(user_message))
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
+            system_prompt = f"""{self._persona_header}
 
 The user just greeted you. Respond warmly and personally, then smoothly introduce your movie expertise.
 Keep it conversational and inviting. Ask what kind of movies they're in the mood for.
@@ -1084,13 +1928,16 @@ Be natural, friendly, and show enthusiasm for helping with movies."""
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
-                temperature=0.8
+                temperature=0.8,
+                max_tokens=RESPONSE_MAX_TOKENS
             )
             
-            return response.choices[0].message.content
+            reply = response.choices[0].message.content
+            self._response_cache.set(cache_key, reply)
+            return reply
             
         except Exception as e:
-            logger.error(f"Error generating greeting response: {str(e)}")
+            logger.error("Error generating greeting response: %s", e)
             return "Hello! I'm your AI movie assistant. I'm here to help you discover amazing movies. What kind of movies are you in the mood for today?"
     
     def _generate_personal_response(self, user_message: str, intent: Dict[str, Any]) -> str:
@@ -1100,12 +1947,14 @@ Be natural, friendly, and show enthusiasm for helping with movies."""
             emotional_tone = personal_context.get("emotional_tone", "neutral")
             requires_empathy = personal_context.get("requires_empathy", False)
             
-            system_prompt = f"""You are {self.agent_personality['name']}, a {self.agent_personality['role']}.
-You are {', '.join(self.agent_personality['traits'])}.
+            cache_key = ("personal", emotional_tone, requires_empathy, _message_key(user_message))
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
+            system_prompt = f"""{self._persona_header}
 
 The user asked a personal question or shared something personal. 
-Emotional tone detected: {emotional_tone}
-Requires empathy: {requires_empathy}
 
 Respond personally and authentically as an AI assistant. Be empathetic if needed.
 After addressing their personal question, gently connect it to movies if appropriate.
@@ -1113,8 +1962,13 @@ For example, if they're sad, you might suggest uplifting movies.
 
 Be genuine, caring, and helpful."""
 
+            # Keep the per-message tone out of the static prompt so its prefix stays cacheable
+            tone_context = f"""Emotional tone detected: {emotional_tone}
+Requires empathy: {requires_empathy}"""
+
             messages = [
                 {"role": "system", "content": system_prompt},
+                {"role": "system", "content": tone_context},
                 {"role": "user", "content": user_message}
             ]
             
@@ -1123,133 +1977,142 @@ Be genuine, caring, and helpful."""
                 logger.error("No messages to send to Together API")
                 return "I found some movies but couldn't generate a proper response. Please try again."
             
-            # Ensure all messages have valid structure
-            for msg in messages:
-                if not isinstance(msg.get("content"), str) or not msg.get("content").strip():
-                    logger.error(f"Invalid message content: {msg}")
-                    return "I found some movies but encountered an issue generating the response."
+            # The prompts are fixed text, so only the user message can be empty
+            if not user_message.strip():
+                logger.error("Empty user message for personal response")
+                return "I found some movies but encountered an issue generating the response."
             
             try:
                 # Validate model name and parameters
                 if not self.model or not isinstance(self.model, str):
-                    logger.error(f"Invalid model: {self.model}")
+                    logger.error("Invalid model: %s", self.model)
                     return "I found some movies but couldn't generate a proper response. Please try again."
                 
-                # Ensure max_tokens is within valid range
-                max_tokens = min(500, 4000)  # Together API limit
-                
                 response = self.client.chat.completions.create(
                     model=self.model,
                     messages=messages,
-                    temperature=0.7
+                    temperature=0.7,
+                    max_tokens=RESPONSE_MAX_TOKENS
                 )
             except Exception as api_error:
-                logger.error(f"Together API call failed: {api_error}")
+                logger.error("Together API call failed: %s", api_error)
                 return "I found some movies but couldn't generate a detailed response. Please try again."
             
-            return response.choices[0].message.content
+            reply = response.choices[0].message.content
+            self._response_cache.set(cache_key, reply)
+            return reply
             
         except Exception as e:
-            logger.error(f"Error generating personal response: {str(e)}")
+            logger.error("Error generating personal response: %s", e)
             return "I'm doing well, thank you for asking! As an AI movie assistant, I'm always excited to help people discover great movies. How can I help you find something amazing to watch?"
     
-    def _generate_movie_response(self, user_message: str, intent: Dict[str, Any], search_results: List[Dict] = None) -> str:
-        """Generate intelligent movie response with search results"""
-        try:
-            movie_details = intent.get("movie_details", {})
-            
-            # Build context from search results
-            search_context = ""
-            if search_results and isinstance(search_results, dict):
-                movies_list = search_results.get('movies', [])
-                search_context = f"\nI found these movies for you:\n"
-                for i, movie in enumerate(movies_list[:8]):  # Limit to 8 for context
-                    quality = movie.get('quality', 'Unknown')
-                    if isinstance(quality, list):
-                        quality = ', '.join(str(q) for q in quality)
-                    search_context += f"- {movie.get('title', 'Unknown')} ({movie.get('year', 'Unknown')}) - {quality} from {movie.get('source', 'Unknown')}\n"
-            elif search_results and isinstance(search_results, list):
-                search_context = f"\nI found these movies for you:\n"
-                for i, movie in enumerate(search_results[:8]):  # Limit to 8 for context
-                    quality = movie.get('quality', 'Unknown')
-                    if isinstance(quality, list):
-                        quality = ', '.join(str(q) for q in quality)
-                    search_context += f"- {movie.get('title', 'Unknown')} ({movie.get('year', 'Unknown')}) - {quality} from {movie.get('source', 'Unknown')}\n"
-            else:
-                search_context = "\nI couldn't find specific movies matching your request, but I can still help with recommendations."
-            
-            # Get user intent analysis for better context
-            user_analysis = intent.get("user_intent_analysis", {})
-            what_they_want = user_analysis.get("what_they_want", "movies")
-            is_specific_movie = user_analysis.get("is_specific_movie", False)
-            
-            # Get movie research details if available
-            movie_research = movie_details.get("movie_research", {})
-            
-            system_prompt = f"""You are {self.agent_personality['name']}, a {self.agent_personality['role']}.
-You are {', '.join(self.agent_personality['traits'])}.
-
-IMPORTANT: DO NOT list individual movies in your response. The UI already displays movies in a structured format below your response.
-
-UNDERSTAND THE USER'S REQUEST:
-The user wants: {what_they_want}
-Is this a specific movie request: {is_specific_movie}
-
-{'MOVIE RESEARCH DETAILS:' if movie_research else ''}
-{f"- Full Title: {movie_research.get('full_title', '')}" if movie_research.get('full_title') else ''}
-{f"- Release Year: {movie_research.get('release_year', '')}" if movie_research.get('release_year') else ''}
-{f"- Key Details: {movie_research.get('key_details', '')}" if movie_research.get('key_details') else ''}
-{f"- Alternate Names: {movie_research.get('alternate_names', [])}" if movie_research.get('alternate_names') else ''}
-
-User preferences:
-- Movie titles: {movie_details.get('movie_titles', [])}
-- Genres: {movie_details.get('genres', [])}
-- Themes: {movie_details.get('themes', [])}
-- Years: {movie_details.get('years', [])}
-- Language: {movie_details.get('language', 'any')}
-
-SEARCH RESULTS CONTEXT:
-{search_context}
-
-RESPOND INTELLIGENTLY:
+    def _build_movie_response_prompt(self, intent: Dict[str, Any], search_results: List[Dict] = None) -> Tuple[str, str]:
+        """Build the static system prompt and the per-request context for movie responses"""
+        movie_details = intent.get("movie_details", {})
+        
+        # Build context from search results, which may be a search response dict or a plain movie list
+        if isinstance(search_results, dict):
+            movies_list = search_results.get('movies', [])
+        else:
+            movies_list = search_results if isinstance(search_results, list) else None
+        
+        if movies_list:
+            # Limit to 8 for context
+            search_context = "\nI found these movies for you:\n" + "\n".join(map(_format_movie_line, movies_list[:8]))
+        else:
+            search_context = "\nI couldn't find specific movies matching your request, but I can still help with recommendations."
+        
+        # Get user intent analysis for better context
+        user_analysis = intent.get("user_intent_analysis", {})
+        what_they_want = user_analysis.get("what_they_want", "movies")
+        is_specific_movie = user_analysis.get("is_specific_movie", False)
+        
+        # Get movie research details if available
+        movie_research = movie_details.get("movie_research", {})
+        
+        # The static instructions are formatted once per agent, so they stay byte-identical
+        # across calls and the provider can reuse its prompt cache
+        system_prompt = self._movie_system_prompt
 
-If this is a SPECIFIC MOVIE request and movies were found:
-- Confirm if the found movie matches what they're looking for
-- Mention the movie details you researched (title, year, key info)
-- Ask for confirmation: "Is this the {movie_research.get('full_title', 'movie')} you were looking for?"
-- Highlight the available qualities and sources
+        request_context = f"""UNDERSTAND THE USER'S REQUEST:
+The user wants: {what_they_want}
+Is this a specific movie request: {is_specific_movie}
 
-If this is a SPECIFIC MOVIE request but no movies found:
-- Acknowledge the specific movie they wanted
-- Mention the correct details you found about the movie
-- Suggest alternative search terms or spellings
-- Offer to search for similar movies or the sequel/prequel
+{_research_context(movie_research, _MOVIE_RESEARCH_FIELDS, heading="MOVIE RESEARCH DETAILS:")}
 
-If this is a GENERAL movie request:
-- Acknowledge their preferences and mood
-- Comment on the variety of results found
-- Give personalized recommendations based on their criteria
+User preferences:
+- Movie titles: {movie_details.get('movie_titles', [])}
+- Genres: {movie_details.get('genres', [])}
+- Themes: {movie_details.get('themes', [])}
+- Years: {movie_details.get('years', [])}
+- Language: {movie_details.get('language', 'any')}
 
-Be helpful, specific, and always confirm when dealing with specific movie requests!"""
+SEARCH RESULTS CONTEXT:
+{search_context}"""
 
-            # Add to conversation history
-            self.conversation_history.append({"role": "user", "content": user_message})
-            
-            # Build messages with proper validation
-            messages = [{"role": "system", "content": system_prompt}]
-            
-            # Add conversation history with validation
-            if self.conversation_history:
-                # Only add valid messages and limit to prevent token overflow
-                valid_history = []
-                for msg in self.conversation_history[-4:]:  # Reduced from 6 to 4
-                    if isinstance(msg, dict) and "role" in msg and "content" in msg:
-                        # Ensure content is string and not too long
-                        content = str(msg["content"])[:1000]  # Limit content length
-                        if content.strip():  # Only add non-empty content
-                            valid_history.append({"role": msg["role"], "content": content})
-                
-                messages.extend(valid_history)
+        return system_prompt, request_context
+    
+    def _truncate_to_tokens(self, content: str, limit: int) -> Tuple[str, int]:
+        """Cut content to at most limit tokens and return it with its token count"""
+        if self._tok is None:
+            # Without a tokenizer, estimate roughly 4 characters per token
+            content = content[:limit * 4]
+            return content, (len(content) + 3) // 4
+        
+        tokens = self._tok.encode(content)
+        if len(tokens) > limit:
+            tokens = tokens[:limit]
+            content = self._tok.decode(tokens)
+        return content, len(tokens)
+    
+    def _pop_oldest_history(self):
+        """Drop the oldest history entry and its token count"""
+        self.conversation_history.popleft()
+        self._history_tok_total -= self._history_tokens.popleft()
+    
+    def _append_history(self, role: str, content: Any):
+        """Validate a turn once when it is recorded and evict old turns to stay within the token budget"""
+        content = str(content)
+        if not content.strip():  # Only keep non-empty content
+            return
+        
+        content, tok_count = self._truncate_to_tokens(content, HISTORY_TOKEN_BUDGET)
+        if len(self.conversation_history) == self.conversation_history.maxlen:
+            self._pop_oldest_history()
+        
+        self.conversation_history.append({"role": role, "content": content})
+        self._history_tokens.append(tok_count)
+        self._history_tok_total += tok_count
+        
+        while self._history_tok_total > HISTORY_TOKEN_BUDGET:
+            self._pop_oldest_history()
+    
+    def _recent_history_messages(self) -> List[Dict[str, str]]:
+        """Return the conversation history entries for the prompt"""
+        # _append_history keeps the history within HISTORY_TOKEN_BUDGET
+        return list(self.conversation_history)
+    
+    def _build_movie_response_messages(self, user_message: str, intent: Dict[str, Any], search_results: List[Dict] = None) -> List[Dict[str, str]]:
+        """Record the user turn and build the messages for a movie response"""
+        system_prompt, request_context = self._build_movie_response_prompt(intent, search_results)
+        
+        # Add to conversation history
+        self._append_history("user", user_message)
+        
+        # Build messages with proper validation
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": request_context}
+        ]
+        
+        # Add conversation history with validation
+        messages.extend(self._recent_history_messages())
+        return messages
+    
+    def _generate_movie_response(self, user_message: str, intent: Dict[str, Any], search_results: List[Dict] = None) -> str:
+        """Generate intelligent movie response with search results"""
+        try:
+            messages = self._build_movie_response_messages(user_message, intent, search_results)
             
             # Validate parameters before API call
             if not self.model or not messages:
@@ -1259,23 +2122,60 @@ Be helpful, specific, and always confirm when dealing with specific movie reques
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
-                temperature=0.7
+                temperature=0.7,
+                max_tokens=RESPONSE_MAX_TOKENS
             )
             
             assistant_response = response.choices[0].message.content
             
             # Add assistant response to history
-            self.conversation_history.append({"role": "assistant", "content": assistant_response})
+            self._append_history("assistant", assistant_response)
             
             return assistant_response
             
         except Exception as e:
-            logger.error(f"Error generating movie response: {str(e)}")
+            logger.error("Error generating movie response: %s", e)
             if search_results:
                 return f"I found {len(search_results)} movies for you! Check out the results below - they include different qualities and sources. Click 'Extract Links' on any movie to get download options."
             else:
                 return "I'd love to help you find some great movies! Could you tell me more about what you're looking for? Maybe a specific genre, actor, or type of mood you're in?"
     
+    def _generate_movie_response_stream(self, user_message: str, intent: Dict[str, Any], search_results: List[Dict] = None) -> Iterator[str]:
+        """Stream the movie response; the full reply is added to history once the stream ends"""
+        chunks = []
+        try:
+            messages = self._build_movie_response_messages(user_message, intent, search_results)
+            
+            for delta in self._stream_completion(messages, temperature=0.7):
+                chunks.append(delta)
+                yield delta
+            
+            # Add assistant response to history
+            self._append_history("assistant", "".join(chunks))
+            
+        except Exception as e:
+            logger.error("Error streaming movie response: %s", e)
+            if chunks:
+                return
+            if search_results:
+                yield f"I found {len(search_results)} movies for you! Check out the results below - they include different qualities and sources. Click 'Extract Links' on any movie to get download options."
+            else:
+                yield "I'd love to help you find some great movies! Could you tell me more about what you're looking for? Maybe a specific genre, actor, or type of mood you're in?"
+    
+    def _parse_reply_with_suggestions(self, response_text: str) -> Dict[str, Any]:
+        """Parse a combined {"response", "suggestions"} reply, raising ValueError if it has the wrong shape"""
+        combined = self._parse_json_object(response_text) or {}
+        
+        assistant_response = combined.get("response")
+        suggestions = combined.get("suggestions")
+        if not isinstance(assistant_response, str) or not assistant_response.strip() or not isinstance(suggestions, list):
+            raise ValueError(f"Unexpected combined response shape: {response_text[:200]}")
+        
+        return {
+            "response": assistant_response,
+            "suggestions": [str(s).strip() for s in suggestions if str(s).strip()][:5]
+        }
+    
     def _generate_selection_response(self, user_message: str, intent: Dict[str, Any], movie_titles: List[str]) -> str:
         """Generate a response that explains movie selection chips"""
         try:
@@ -1297,345 +2197,319 @@ RESPOND WITH:
 Keep response concise and focused on guiding them to select a specific movie."""
 
             response = self.client.chat.completions.create(
-                model=self.model,
+                model=self.fast_model,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_message}
                 ],
-                temperature=0.7
+                temperature=0.7,
+                max_tokens=CONFIRMATION_MAX_TOKENS,
+                stop=REPLY_STOP
             )
             
             return response.choices[0].message.content
             
         except Exception as e:
-            logger.error(f"Error generating selection response: {str(e)}")
+            logger.error("Error generating selection response: %s", e)
             # Fallback response
             return f"I found several great movies for you! Please click on one of the movie titles below to search for it specifically."
 
-    def _generate_simple_movie_response(self, user_message: str, intent: Dict[str, Any], movies: List[Dict[str, Any]]) -> str:
-        """Generate a simple response for found movies without listing them individually"""
+    def _llm_respond(self, messages: List[Dict[str, str]], fallback: str, *, label: str,
+                     model: Optional[str] = None, max_tokens: int = RESPONSE_MAX_TOKENS,
+                     stop: Optional[List[str]] = None, temperature: float = 0.7, cache_key: Any = None) -> str:
+        """Run one reply completion, returning fallback without an API key or on error.
+        With a cache_key, replies are shared through the response cache.
+        """
+        if not self.has_api_key:
+            return fallback
+        
+        if cache_key is not None:
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
-            if not movies:
-                return "I couldn't find any movies matching your request. Please try a different search term."
-            
-            total_found = len(movies)
-            
-            # Check if this is a specific movie request
-            user_analysis = intent.get("user_intent_analysis", {})
-            is_specific = user_analysis.get("is_specific_movie", False)
-            movie_research = intent.get("movie_details", {}).get("movie_research", {})
+            response = self.client.chat.completions.create(
+                model=model or self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stop=stop
+            )
             
-            if not self.has_api_key:
-                # Simple fallback response when no API key
-                if is_specific and movie_research.get('full_title'):
-                    return f"Great! I found {total_found} result(s) for '{movie_research['full_title']}'. Check out the movies below and click 'Extract Links' to get download options!"
-                else:
-                    return f"Perfect! I found {total_found} movies for you. Browse through the results below and click 'Extract Links' on any movie to get download options!"
+            reply = response.choices[0].message.content
+            if cache_key is not None:
+                self._response_cache.set(cache_key, reply)
+            return reply
             
-            system_prompt = f"""You are a movie download assistant. The user searched for movies and you found results.
-
-USER REQUEST: "{user_message}"
+        except Exception as e:
+            logger.error("Error generating %s response: %s", label, e)
+            return fallback
+    
+    def _generate_simple_movie_response(self, user_message: str, intent: Dict[str, Any], movies: List[Dict[str, Any]]) -> str:
+        """Generate a simple response for found movies without listing them individually"""
+        if not movies:
+            return "I couldn't find any movies matching your request. Please try a different search term."
+        
+        total_found = len(movies)
+        
+        # Check if this is a specific movie request
+        user_analysis = intent.get("user_intent_analysis", {})
+        is_specific = user_analysis.get("is_specific_movie", False)
+        movie_research = intent.get("movie_details", {}).get("movie_research", {})
+        
+        if is_specific and movie_research.get('full_title'):
+            fallback = f"Great! I found {total_found} result(s) for '{movie_research['full_title']}'. Check out the movies below and click 'Extract Links' to get download options!"
+        else:
+            fallback = f"Perfect! I found {total_found} movies for you. Browse through the results below and click 'Extract Links' on any movie to get download options!"
+        
+        request_context = f"""USER REQUEST: "{user_message}"
 IS SPECIFIC MOVIE: {is_specific}
 MOVIES FOUND: {total_found}
 
-{'MOVIE RESEARCH:' if movie_research else ''}
-{f"- Title: {movie_research.get('full_title', '')}" if movie_research.get('full_title') else ''}
-{f"- Year: {movie_research.get('release_year', '')}" if movie_research.get('release_year') else ''}
-
-IMPORTANT: DO NOT list individual movies in your response. The UI displays movies in cards below your response.
-
-RESPOND WITH:
-1. Confirm you found the movie(s) they wanted
-2. Mention the number of results found
-3. Guide them to click "Extract Links" to get download links
-4. Be enthusiastic about helping them download movies
-
-If specific movie: Confirm if this matches what they wanted
-If general request: Mention the variety of options found
-
-Keep response focused on DOWNLOADING and be concise."""
+{_research_context(movie_research, _RESEARCH_FIELDS[:2])}"""
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            logger.error(f"Error generating simple movie response: {str(e)}")
-            # Fallback response
-            if movies:
-                return f"Great! I found {len(movies)} movies for you. Check out the results below and click 'Extract Links' on any movie to get download options!"
-            else:
-                return "I couldn't find any movies matching your request. Please try a different search term."
+        messages = [
+            {"role": "system", "content": SIMPLE_MOVIE_SYSTEM_PROMPT},
+            {"role": "system", "content": request_context},
+            {"role": "user", "content": user_message}
+        ]
+        # The reply only depends on what was searched for and how many results came back
+        cache_key = ("simple", is_specific, total_found,
+                     movie_research.get('full_title') or _message_key(user_message), movie_research.get('release_year'))
+        return self._llm_respond(messages, fallback, label="simple movie", model=self.fast_model,
+                                 max_tokens=CONFIRMATION_MAX_TOKENS, stop=REPLY_STOP, cache_key=cache_key)
 
     def _generate_download_focused_response(self, user_message: str, intent: Dict[str, Any], search_results: Dict[str, Any]) -> str:
         """Generate download-focused response when movies are found"""
-        try:
-            movies_list = search_results.get('movies', [])
-            total_found = len(movies_list)
-            
-            if total_found == 0:
-                return "I couldn't find any movies matching your request in our download sources. Let me try some alternative search terms for you."
-            
-            # Build context about found movies
-            movie_context = f"Found {total_found} movie(s) with download links:\n"
-            for i, movie in enumerate(movies_list[:5]):  # Show top 5
-                quality = movie.get('quality', 'Unknown')
-                if isinstance(quality, list):
-                    quality = ', '.join(str(q) for q in quality)
-                movie_context += f"- {movie.get('title', 'Unknown')} ({movie.get('year', 'Unknown')}) - {quality} from {movie.get('source', 'Unknown')}\n"
-            
-            # Check if this is a specific movie request
-            user_analysis = intent.get("user_intent_analysis", {})
-            is_specific = user_analysis.get("is_specific_movie", False)
-            movie_research = intent.get("movie_details", {}).get("movie_research", {})
-            
-            system_prompt = f"""You are a movie download assistant. Users come here specifically to download movies.
-            
-IMPORTANT: DO NOT list individual movies in your response. The UI displays movies in cards below your response.
-
-USER REQUEST: "{user_message}"
+        movies_list = search_results.get('movies', [])
+        total_found = len(movies_list)
+        
+        if total_found == 0:
+            return "I couldn't find any movies matching your request in our download sources. Let me try some alternative search terms for you."
+        
+        # Summarize the top 5 results; the reply mentions sources and qualities, not individual movies
+        top_movies = movies_list[:5]
+        sources = dict.fromkeys(str(movie['source']) for movie in top_movies if movie.get('source'))
+        qualities = dict.fromkeys(
+            str(quality)
+            for movie in top_movies
+            for quality in (movie.get('quality') if isinstance(movie.get('quality'), list) else [movie.get('quality')])
+            if quality
+        )
+        movie_context = f"""Found {total_found} movie(s) with download links.
+Sources: {', '.join(sources) or 'Unknown'}
+Qualities: {', '.join(qualities) or 'Unknown'}"""
+        
+        # Check if this is a specific movie request
+        user_analysis = intent.get("user_intent_analysis", {})
+        is_specific = user_analysis.get("is_specific_movie", False)
+        movie_research = intent.get("movie_details", {}).get("movie_research", {})
+        
+        request_context = f"""USER REQUEST: "{user_message}"
 IS SPECIFIC MOVIE: {is_specific}
 
 SEARCH RESULTS CONTEXT:
 {movie_context}
 
-{'MOVIE RESEARCH:' if movie_research else ''}
-{f"- Title: {movie_research.get('full_title', '')}" if movie_research.get('full_title') else ''}
-{f"- Year: {movie_research.get('release_year', '')}" if movie_research.get('release_year') else ''}
-{f"- Details: {movie_research.get('key_details', '')}" if movie_research.get('key_details') else ''}
-
-RESPOND WITH:
-1. Confirm you found the movie(s) they wanted
-2. Highlight the available sources and qualities
-3. Guide them to click "Extract Links" to get download links
-4. Be enthusiastic about helping them download movies
-
-If specific movie: Confirm if this matches what they wanted
-If general request: Mention the variety of options found
-
-Keep response focused on DOWNLOADING, not streaming platforms."""
+{_research_context(movie_research)}"""
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            logger.error(f"Error generating download-focused response: {str(e)}")
-            return f"Great! I found {len(search_results.get('movies', []))} movies for you with download links. Click 'Extract Links' on any movie below to get the download options!"
+        messages = [
+            {"role": "system", "content": DOWNLOAD_RESPONSE_SYSTEM_PROMPT},
+            {"role": "system", "content": request_context},
+            {"role": "user", "content": user_message}
+        ]
+        cache_key = ("download", is_specific, movie_context,
+                     movie_research.get('full_title') or _message_key(user_message), movie_research.get('key_details'))
+        return self._llm_respond(messages, DOWNLOAD_FALLBACK_REPLY.format(total_found=total_found), label="download-focused",
+                                 model=self.fast_model, max_tokens=CONFIRMATION_MAX_TOKENS, stop=REPLY_STOP, cache_key=cache_key)
     
     def _generate_no_results_response(self, user_message: str, intent: Dict[str, Any], search_query: str) -> str:
         """Generate helpful response when no movies are found in APIs"""
-        try:
-            movie_details = intent.get("movie_details", {})
-            movie_research = movie_details.get("movie_research", {})
-            
-            system_prompt = f"""You are a movie download assistant. The user searched for a movie but we couldn't find it in our download sources.
-
-USER SEARCHED FOR: "{user_message}"
+        movie_research = intent.get("movie_details", {}).get("movie_research", {})
+        return self._llm_respond(self._build_no_results_messages(user_message, intent, search_query),
+                                 _no_results_fallback(movie_research, search_query), label="no-results", model=self.fast_model)
+    
+    def _build_no_results_messages(self, user_message: str, intent: Dict[str, Any], search_query: str) -> List[Dict[str, str]]:
+        """Build the messages for a no-results response"""
+        movie_research = intent.get("movie_details", {}).get("movie_research", {})
+        request_context = f"""USER SEARCHED FOR: "{user_message}"
 SEARCH QUERY USED: "{search_query}"
 
-{'MOVIE RESEARCH:' if movie_research else ''}
-{f"- Title: {movie_research.get('full_title', '')}" if movie_research.get('full_title') else ''}
-{f"- Year: {movie_research.get('release_year', '')}" if movie_research.get('release_year') else ''}
-{f"- Details: {movie_research.get('key_details', '')}" if movie_research.get('key_details') else ''}
-
-PROVIDE A HELPFUL RESPONSE:
-1. Acknowledge the specific movie they wanted (if you have research info)
-2. Explain that it's not currently available in our download sources
-3. Suggest possible reasons (too new, different spelling, not yet released)
-4. Offer to try alternative search terms
-5. Suggest similar movies if possible
-
-Be helpful and encouraging, not dismissive. Focus on finding download solutions."""
+{_research_context(movie_research)}"""
 
+        return [
+            {"role": "system", "content": NO_RESULTS_SYSTEM_PROMPT},
+            {"role": "system", "content": request_context},
+            {"role": "user", "content": user_message}
+        ]
+    
+    def _generate_no_results_response_with_suggestions(self, user_message: str, intent: Dict[str, Any], search_query: str) -> Dict[str, Any]:
+        """Generate the no-results response and search suggestions with a single completion.
+        Falls back to separate _generate_no_results_response / generate_search_suggestions
+        calls when the combined reply can't be parsed.
+        """
+        if not self.has_api_key:
+            # Both fallbacks are canned, so there is nothing to run side by side
+            return {
+                "response": self._generate_no_results_response(user_message, intent, search_query),
+                "suggestions": self.generate_search_suggestions(user_message)
+            }
+        
+        try:
+            messages = self._build_no_results_messages(user_message, intent, search_query)
+            messages.insert(2, {"role": "system", "content": MOVIE_RESPONSE_WITH_SUGGESTIONS_FORMAT})
+            
             response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.7
+                model=self.fast_model,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=RESPONSE_MAX_TOKENS + SUGGESTIONS_MAX_TOKENS,
+                response_format={"type": "json_object"}
             )
             
-            return response.choices[0].message.content
+            return self._parse_reply_with_suggestions(response.choices[0].message.content)
             
         except Exception as e:
-            logger.error(f"Error generating no-results response: {str(e)}")
-            # Fallback response
-            if movie_research.get('full_title'):
-                return f"I understand you're looking for '{movie_research['full_title']}' ({movie_research.get('release_year', 'Unknown year')}). Unfortunately, it's not currently available in our download sources. This could be because it's very new, not yet released, or might be listed under a different name. Try searching with alternative spellings or let me know if you'd like suggestions for similar movies!"
-            else:
-                return f"I couldn't find '{search_query}' in our current download sources. This might be because it's very new, not yet released, or listed differently. Try alternative spellings or let me know if you'd like suggestions for similar movies!"
+            logger.warning("Combined no-results response failed, using separate calls: %s", e)
+        
+        # The two completions don't depend on each other, so run them side by side
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            response_future = executor.submit(self._generate_no_results_response, user_message, intent, search_query)
+            suggestions_future = executor.submit(self.generate_search_suggestions, user_message)
+            return {
+                "response": response_future.result(),
+                "suggestions": suggestions_future.result()
+            }
     
     def _generate_date_time_response(self, user_message: str, intent: Dict[str, Any]) -> str:
         """Generate response for date/time questions"""
-        try:
-            from datetime import datetime
-            import pytz
-            
-            # Get current date and time
-            now = datetime.now()
-            current_date = now.strftime("%A, %B %d, %Y")
-            current_time = now.strftime("%I:%M %p")
-            
-            # Determine what specific info they want
-            message_lower = user_message.lower()
-            
-            if 'time' in message_lower:
-                return f"The current time is {current_time}. Is there a specific movie you'd like to watch today?"
-            elif 'day' in message_lower:
-                day_name = now.strftime("%A")
-                return f"Today is {day_name}. Perfect day for watching a good movie! What genre are you in the mood for?"
-            else:
-                return f"Today's date is {current_date}. How about we find you a great movie to watch today?"
-                
-        except Exception as e:
-            logger.error(f"Error generating date/time response: {str(e)}")
-            return "I can help you with movie recommendations! What kind of movies are you interested in watching?"
+        # Pick the reply for what they asked about, defaulting to the full date
+        message_lower = user_message.lower()
+        template = next((reply for word, reply in DATE_TIME_REPLIES if word in message_lower), DATE_REPLY)
+        return datetime.now().strftime(template)
     
     def _generate_information_response(self, user_message: str, intent: Dict[str, Any]) -> str:
         """Generate response for general information requests"""
+        if not self.has_api_key:
+            return "I'm primarily designed to help with movie recommendations and downloads. For general information, I'd suggest checking reliable sources online. Meanwhile, can I help you find some great movies to watch?"
+        
+        return self._llm_respond(
+            self._build_information_response_messages(user_message),
+            "I'm primarily designed to help with movie recommendations and downloads. For detailed information on other topics, I'd suggest checking reliable sources. However, I'd love to help you find some great movies! What genre interests you?",
+            label="information", max_tokens=INFORMATION_MAX_TOKENS, stop=REPLY_STOP
+        )
+    
+    def _build_information_response_messages(self, user_message: str) -> List[Dict[str, str]]:
+        """Build the messages for a general information response"""
+        return [
+            {"role": "system", "content": self._information_system_prompt},
+            {"role": "user", "content": user_message}
+        ]
+    
+    def _generate_information_response_stream(self, user_message: str, intent: Dict[str, Any]) -> Iterator[str]:
+        """Stream the response to a general information request"""
+        streamed = False
         try:
-            if not self.has_api_key:
-                return "I'm primarily designed to help with movie recommendations and downloads. For general information, I'd suggest checking reliable sources online. Meanwhile, can I help you find some great movies to watch?"
-            
-            system_prompt = f"""You are {self.agent_personality['name']}, but the user is asking a general knowledge question, not about movies.
-
-IMPORTANT: You should provide a helpful, accurate answer to their question, but then gently redirect the conversation back to movies since that's your specialty.
-
-Be informative but concise. After answering their question, suggest how you can help them with movies.
-
-User's question: "{user_message}" """
-
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ]
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content
-            
+            messages = self._build_information_response_messages(user_message)
+            for delta in self._stream_completion(messages, temperature=0.7, max_tokens=INFORMATION_MAX_TOKENS, stop=REPLY_STOP):
+                streamed = True
+                yield delta
+                
         except Exception as e:
-            logger.error(f"Error generating information response: {str(e)}")
-            return "I'm primarily designed to help with movie recommendations and downloads. For detailed information on other topics, I'd suggest checking reliable sources. However, I'd love to help you find some great movies! What genre interests you?"
+            logger.error("Error streaming information response: %s", e)
+            if not streamed:
+                yield "I'm primarily designed to help with movie recommendations and downloads. For detailed information on other topics, I'd suggest checking reliable sources. However, I'd love to help you find some great movies! What genre interests you?"
+    
+    def _build_general_response_messages(self, user_message: str) -> List[Dict[str, str]]:
+        """Build the messages for a general conversational response"""
+        return [
+            {"role": "system", "content": self._general_system_prompt},
+            {"role": "user", "content": user_message}
+        ]
     
     def _generate_general_response(self, user_message: str, intent: Dict[str, Any]) -> str:
         """Generate general conversational response"""
+        return self._llm_respond(self._build_general_response_messages(user_message), GENERAL_FALLBACK_REPLY,
+                                 label="general", cache_key=("general", _message_key(user_message)))
+    
+    def _generate_general_response_stream(self, user_message: str, intent: Dict[str, Any]) -> Iterator[str]:
+        """Stream the general conversational response, sharing the reply cache with the blocking path"""
+        if not self.has_api_key:
+            yield GENERAL_FALLBACK_REPLY
+            return
+        
+        cache_key = ("general", _message_key(user_message))
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        chunks = []
+        streamed = False
         try:
-            system_prompt = f"""You are {self.agent_personality['name']}, a {self.agent_personality['role']}.
-You are {', '.join(self.agent_personality['traits'])}.
-
-The user said something that's not specifically about movies or personal questions.
-Respond helpfully and try to guide the conversation toward movies if appropriate.
-Be conversational and show your movie expertise.
-
-Keep responses concise but engaging."""
-
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ]
-            
-            # Validate parameters
-            if not self.model or not messages:
-                logger.error("Invalid parameters for general response")
-                return "I'm here to help you discover amazing movies! Is there anything specific you'd like to watch, or would you like me to suggest something based on your mood?"
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content
+            for delta in self._stream_completion(self._build_general_response_messages(user_message), temperature=0.7):
+                streamed = True
+                chunks.append(delta)
+                yield delta
             
+            self._response_cache.set(cache_key, "".join(chunks))
+                
         except Exception as e:
-            logger.error(f"Error generating general response: {str(e)}")
-            return "I'm here to help you discover amazing movies! Is there anything specific you'd like to watch, or would you like me to suggest something based on your mood?"
+            logger.error("Error streaming general response: %s", e)
+            if not streamed:
+                yield GENERAL_FALLBACK_REPLY
     
     def extract_movie_search_query(self, intent: Dict[str, Any]) -> str:
         """Extract the best search query for movie API with intelligent prioritization"""
-        movie_details = intent.get("movie_details", {})
-        user_analysis = intent.get("user_intent_analysis", {})
+        # The LLM may send null sections, so treat those like missing ones
+        movie_details = intent.get("movie_details") or {}
         
         # Priority 1: Specific movie with research (highest priority)
-        if user_analysis.get("is_specific_movie") and movie_details.get("movie_research"):
-            movie_research = movie_details["movie_research"]
-            full_title = movie_research.get("full_title", "")
-            release_year = movie_research.get("release_year", "")
-            
-            # Use full title with year for specific movies
-            if full_title and release_year:
-                return f"{full_title} {release_year}"
-            elif full_title:
-                return full_title
+        movie_research = movie_details.get("movie_research")
+        if movie_research and (intent.get("user_intent_analysis") or {}).get("is_specific_movie"):
+            full_title = movie_research.get("full_title")
+            if full_title:
+                # Use full title with year for specific movies
+                release_year = movie_research.get("release_year")
+                return f"{full_title} {release_year}" if release_year else full_title
         
         # Priority 2: Specific movie titles mentioned
-        if movie_details.get("movie_titles"):
-            return movie_details["movie_titles"][0]
+        movie_titles = movie_details.get("movie_titles")
+        if movie_titles:
+            return movie_titles[0]
         
         # Priority 3: Pre-built search query from LLM analysis
-        if movie_details.get("search_query"):
-            return movie_details["search_query"]
+        search_query = movie_details.get("search_query")
+        if search_query:
+            return search_query
         
         # Priority 4: Build intelligent query from components
         query_parts = []
         
         # Add language preference first (important for filtering)
-        if movie_details.get("language") and movie_details["language"] != "any":
-            query_parts.append(movie_details["language"])
+        language = movie_details.get("language")
+        if language and language != "any":
+            query_parts.append(language)
         
         # Add genres (most important for discovery)
-        if movie_details.get("genres"):
-            query_parts.extend(movie_details["genres"][:2])  # Top 2 genres
+        query_parts.extend(islice(movie_details.get("genres") or (), 2))  # Top 2 genres
         
         # Add themes (very specific)
-        if movie_details.get("themes"):
-            query_parts.extend(movie_details["themes"][:1])  # Top theme
+        query_parts.extend(islice(movie_details.get("themes") or (), 1))  # Top theme
         
         # Add year if recent (helps with relevance)
-        if movie_details.get("years"):
-            years = movie_details["years"]
-            recent_years = [y for y in years if int(y) >= 2020]
-            if recent_years:
-                query_parts.append(recent_years[0])
+        recent_year = next((y for y in movie_details.get("years") or () if int(y) >= 2020), None)
+        if recent_year:
+            query_parts.append(recent_year)
         
         # Add actors (if mentioned specifically)
-        if movie_details.get("actors"):
-            query_parts.append(movie_details["actors"][0])
+        query_parts.extend(islice(movie_details.get("actors") or (), 1))
         
         # Fallback: Create query from mood/context
         if not query_parts:
-            mood = movie_details.get("mood", "")
-            if "exciting" in mood or "action" in mood:
-                return "action movies"
-            elif "funny" in mood or "laugh" in mood:
-                return "comedy movies"
-            elif "romantic" in mood:
-                return "romance movies"
-            elif "scary" in mood:
-                return "horror movies"
-            else:
-                return "popular movies"
+            match = _MOOD_RE.search((movie_details.get("mood") or "").casefold())
+            return _MOOD_QUERIES[match.group()] if match else "popular movies"
         
         return " ".join(query_parts)
     
@@ -1652,55 +2526,91 @@ Keep responses concise but engaging."""
         variations = [main_query]
         
         # Add variations for specific movies
-        if movie_details.get("movie_titles"):
-            title = movie_details["movie_titles"][0]
-            variations.extend([title, f"{title} movie"])
+        movie_titles = movie_details.get("movie_titles")
+        if movie_titles:
+            title = movie_titles[0]
+            variations.extend((title, f"{title} movie"))
             
             # Add year variations if available
-            if movie_details.get("years"):
-                year = movie_details["years"][0]
-                variations.append(f"{title} {year}")
+            years = movie_details.get("years")
+            if years:
+                variations.append(f"{title} {years[0]}")
         
-        return list(set(variations))  # Remove duplicates
+        return list(dict.fromkeys(variations))  # Remove duplicates, keeping the main query first
     
-    def generate_search_suggestions(self, user_message: str) -> List[str]:
-        """Generate search suggestions based on user message"""
+    def generate_search_suggestions(self, user_message: str, min_chars: int = MIN_LLM_MESSAGE_CHARS) -> List[str]:
+        """Generate search suggestions based on user message.
+        Messages under min_chars get the defaults; callers fetching suggestions as the user types
+        should debounce keystrokes and pass a higher min_chars.
+        """
+        # Plain genre requests ("action movies", "something funny") get canned picks without an API call
+        canned = self._canned_search_suggestions(user_message)
+        if canned:
+            return canned
+        
+        if not self.has_api_key or self._too_short_for_llm(user_message, min_chars):
+            return list(DEFAULT_SEARCH_SUGGESTIONS)
+        
+        cache_key = ("suggestions", _message_key(user_message))
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            system_prompt = """Generate 5 movie search suggestions based on the user's message.
-Return only a simple list of movie titles or search terms, one per line.
-Focus on popular, well-known movies that match their request.
-
-Examples:
-- If they want action: "John Wick", "Mission Impossible", "Fast and Furious"
-- If they want comedy: "The Hangover", "Superbad", "Anchorman"
-- If they mention a year: include popular movies from that year"""
-
             messages = [
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": SEARCH_SUGGESTIONS_SYSTEM_PROMPT},
                 {"role": "user", "content": user_message}
             ]
             
             # Validate parameters
             if not self.model or not messages:
                 logger.error("Invalid parameters for search suggestions")
-                return ["Avengers Endgame", "The Dark Knight", "Inception", "Interstellar", "John Wick"]
+                return list(DEFAULT_SEARCH_SUGGESTIONS)
             
             response = self.client.chat.completions.create(
-                model=self.model,
+                model=self.fast_model,
                 messages=messages,
-                temperature=0.8
+                temperature=0.8,
+                max_tokens=SUGGESTIONS_MAX_TOKENS,
+                stop=REPLY_STOP
             )
             
-            suggestions = response.choices[0].message.content.strip().split('\n')
-            return [s.strip('- ').strip() for s in suggestions if s.strip()][:5]
+            content = response.choices[0].message.content
+            suggestions = list(islice((m.group(1) for m in _SUGGESTION_LINE_RE.finditer(content)), 5))
+            if suggestions:
+                self._response_cache.set(cache_key, suggestions)
+            return suggestions
             
         except Exception as e:
-            logger.error(f"Error generating search suggestions: {str(e)}")
-            return ["Avengers Endgame", "The Dark Knight", "Inception", "Interstellar", "John Wick"]
+            logger.error("Error generating search suggestions: %s", e)
+            return list(DEFAULT_SEARCH_SUGGESTIONS)
+    
+    def _too_short_for_llm(self, user_message: str, min_chars: int = MIN_LLM_MESSAGE_CHARS) -> bool:
+        """True for messages too short or bare to be worth an LLM call"""
+        stripped = user_message.strip()
+        if len(stripped) >= min_chars and any(char.isalnum() for char in stripped):
+            return False
+        self._short_input_skips += 1
+        logger.debug("Skipping LLM call for short input %r (%s skipped so far)", stripped, self._short_input_skips)
+        return True
+    
+    def _canned_search_suggestions(self, user_message: str) -> Optional[List[str]]:
+        """Return canned suggestions for short, plain genre requests"""
+        message_lower = user_message.lower()
+        # Years, names and longer requests need the LLM to pick relevant titles
+        if len(message_lower.split()) > 4 or _DIGIT_RE.search(message_lower):
+            return None
+        
+        for keyword, genre in GENRE_SUGGESTION_KEYWORDS:
+            if keyword in message_lower:
+                return list(GENRE_SUGGESTIONS[genre])
+        return None
     
     def clear_conversation(self):
         """Clear conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
+        self._history_tokens.clear()
+        self._history_tok_total = 0
         logger.info("Conversation history cleared")
 
 def main():
@@ -4,22 +4,57 @@ Memory optimization utilities for Movie Agent
 Reduces memory usage to prevent exceeding limits on free hosting platforms
 """
 
+import ctypes
 import gc
 import logging
 import psutil
 import os
+import time
 from typing import List, Dict, Any
 
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between memory checks made by the decorator; the informational
+# before-call sample and the after-call critical check are gated separately
+MEMORY_CHECK_INTERVAL = 0.1
+_last_sample = [0.0]
+_last_critical_check = [0.0]
+
+def _memory_check_due(last_check: List[float]) -> bool:
+    """True at most once per MEMORY_CHECK_INTERVAL per gate, so back-to-back calls share one check"""
+    now = time.monotonic()
+    if now - last_check[0] < MEMORY_CHECK_INTERVAL:
+        return False
+    last_check[0] = now
+    return True
+
+# Seconds a forced collection waits for the previous one, so repeated high-memory checks don't stack full pauses
+GC_MIN_INTERVAL = 2.0
+_last_gc = [float('-inf')]
+
+# Collect the oldest generation a little more often than the default (700, 10, 10)
+gc.set_threshold(700, 10, 5)
+
+# glibc's malloc_trim hands freed heap memory back to the OS, which Python doesn't do by itself
+try:
+    _malloc_trim = ctypes.CDLL("libc.so.6", use_errno=True).malloc_trim
+    _malloc_trim.argtypes = [ctypes.c_size_t]
+except (OSError, AttributeError):
+    _malloc_trim = None
+
 class MemoryOptimizer:
     """Utility class for memory optimization"""
     
+    # Process handle reused across checks; recreated after a fork
+    _process = None
+    
     @staticmethod
     def get_memory_usage():
         """Get current memory usage in MB"""
         try:
-            process = psutil.Process(os.getpid())
+            process = MemoryOptimizer._process
+            if process is None or process.pid != os.getpid():
+                process = MemoryOptimizer._process = psutil.Process(os.getpid())
             memory_mb = process.memory_info().rss / 1024 / 1024
             return round(memory_mb, 2)
         except:
@@ -28,15 +63,23 @@ class MemoryOptimizer:
     @staticmethod
     def force_garbage_collection():
         """Force garbage collection to free memory"""
+        now = time.monotonic()
+        if now - _last_gc[0] < GC_MIN_INTERVAL:
+            logger.debug("Skipping garbage collection, last one was under %ss ago", GC_MIN_INTERVAL)
+            return 0
+        _last_gc[0] = now
+        
         collected = gc.collect()
-        logger.info(f"Garbage collection freed {collected} objects")
+        if _malloc_trim is not None:
+            _malloc_trim(0)
+        logger.info("Garbage collection freed %s objects", collected)
         return collected
     
     @staticmethod
     def limit_movie_results(movies: List[Dict[str, Any]], max_results: int = 10) -> List[Dict[str, Any]]:
         """Limit movie results to prevent memory overflow"""
         if len(movies) > max_results:
-            logger.info(f"Limiting results from {len(movies)} to {max_results} to save memory")
+            logger.info("Limiting results from %s to %s to save memory", len(movies), max_results)
             return movies[:max_results]
         return movies
     
@@ -52,11 +95,11 @@ class MemoryOptimizer:
     def log_memory_usage(operation: str = ""):
         """Log current memory usage"""
         memory_mb = MemoryOptimizer.get_memory_usage()
-        logger.info(f"Memory usage {operation}: {memory_mb} MB")
+        logger.info("Memory usage %s: %s MB", operation, memory_mb)
         
         # Warning if memory usage is high
         if memory_mb > 400:  # 400MB warning for 512MB limit
-            logger.warning(f"High memory usage detected: {memory_mb} MB")
+            logger.warning("High memory usage detected: %s MB", memory_mb)
             MemoryOptimizer.force_garbage_collection()
     
     @staticmethod
@@ -69,7 +112,8 @@ class MemoryOptimizer:
 def memory_optimized(func):
     """Decorator to add memory optimization to functions"""
     def wrapper(*args, **kwargs):
-        MemoryOptimizer.log_memory_usage(f"before {func.__name__}")
+        if _memory_check_due(_last_sample):
+            MemoryOptimizer.log_memory_usage(f"before {func.__name__}")
         
         try:
             result = func(*args, **kwargs)
@@ -83,11 +127,12 @@ def memory_optimized(func):
             return result
             
         finally:
-            MemoryOptimizer.log_memory_usage(f"after {func.__name__}")
-            
-            # Force garbage collection if memory is high
-            if MemoryOptimizer.is_memory_critical():
-                MemoryOptimizer.force_garbage_collection()
+            if _memory_check_due(_last_critical_check):
+                MemoryOptimizer.log_memory_usage(f"after {func.__name__}")
+                
+                # Force garbage collection if memory is high
+                if MemoryOptimizer.is_memory_critical():
+                    MemoryOptimizer.force_garbage_collection()
     
     return wrapper
 
@@ -0,0 +1,93 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llm_chat_agent
+from config_manager import config_manager
+
+
+def make_keyless_agent():
+    """Agent built as if no Together API key were configured anywhere"""
+    with mock.patch.object(config_manager, 'get_together_api_key', return_value=None), \
+            mock.patch.dict(os.environ, {'TOGETHER_API_KEY': ''}):
+        agent = llm_chat_agent.EnhancedLLMChatAgent()
+    assert not agent.has_api_key
+    return agent
+
+
+class KeylessMovieRequestTest(unittest.TestCase):
+    """Movie requests must fall back to canned replies, not crash, without an API key"""
+
+    def setUp(self):
+        self.agent = make_keyless_agent()
+
+    def test_specific_movie_found(self):
+        self.agent._search_via_api_endpoint = lambda query: {"movies": [{"title": "RRR", "source": "Movierulz"}]}
+        result = self.agent.process_movie_request("rrr")
+        self.assertTrue(result["search_performed"])
+        self.assertIn("RRR", result["response_text"])
+
+    def test_general_movie_found(self):
+        self.agent._search_via_api_endpoint = lambda query: {"movies": [{"title": "John Wick", "source": "Moviezwap"}]}
+        result = self.agent.process_movie_request("action movies")
+        self.assertEqual(len(result["movies"]), 1)
+        self.assertTrue(result["response_text"])
+
+    def test_no_results(self):
+        self.agent._search_via_api_endpoint = lambda query: {"movies": []}
+        result = self.agent.process_movie_request("action movies")
+        self.assertEqual(result["movies"], [])
+        self.assertTrue(result["response_text"])
+        self.assertTrue(result["suggestions"])
+
+    def test_no_results_logs_no_errors(self):
+        self.agent._search_via_api_endpoint = lambda query: {"movies": []}
+        with mock.patch.object(llm_chat_agent.logger, 'error') as log_error, \
+                mock.patch.object(llm_chat_agent, 'ThreadPoolExecutor') as executor:
+            result = self.agent.process_movie_request("some obscure film please")
+        log_error.assert_not_called()
+        executor.assert_not_called()
+        self.assertEqual(result["suggestions"], list(llm_chat_agent.DEFAULT_SEARCH_SUGGESTIONS))
+
+
+class MessageKeyTest(unittest.TestCase):
+    """Cache keys ignore case, punctuation and spacing but not word order"""
+
+    def test_normalizes_case_and_punctuation(self):
+        self.assertEqual(llm_chat_agent._message_key("The Matrix, please!"),
+                         llm_chat_agent._message_key("  the matrix please"))
+
+    def test_keeps_word_order(self):
+        self.assertNotEqual(llm_chat_agent._message_key("movies like dune not dune 2"),
+                            llm_chat_agent._message_key("dune 2 not movies like dune"))
+
+
+class IntentBatchTest(unittest.TestCase):
+    """Batch submission falls back to per-message analysis when no batch job comes back"""
+
+    def setUp(self):
+        self.agent = make_keyless_agent()
+        self.agent.has_api_key = True
+        self.agent._client = mock.MagicMock()
+        self.agent._client.files.upload.return_value = mock.Mock(id="file-1")
+
+    def test_missing_job_analyzes_each_message(self):
+        self.agent._client.batches.create.return_value = mock.Mock(job=None, warning="quota exceeded")
+        with mock.patch.object(self.agent, 'analyze_user_intent') as analyze:
+            batch_id = self.agent.submit_intent_batch(["rrr", "funny movies"])
+        self.assertIsNone(batch_id)
+        self.assertEqual([call.args[0] for call in analyze.call_args_list], ["rrr", "funny movies"])
+
+    def test_created_job_is_tracked(self):
+        self.agent._client.batches.create.return_value = mock.Mock(job=mock.Mock(id="batch-1"))
+        with mock.patch.object(self.agent, 'analyze_user_intent') as analyze:
+            batch_id = self.agent.submit_intent_batch(["rrr"])
+        self.assertEqual(batch_id, "batch-1")
+        analyze.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
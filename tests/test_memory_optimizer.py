@@ -0,0 +1,34 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import memory_optimizer
+from memory_optimizer import MemoryOptimizer, memory_optimized
+
+
+class MemoryOptimizedDecoratorTest(unittest.TestCase):
+    """The after-call critical check must not be swallowed by the before-call sample"""
+
+    def setUp(self):
+        memory_optimizer._last_sample[0] = 0.0
+        memory_optimizer._last_critical_check[0] = 0.0
+
+    def test_fast_call_still_collects_when_memory_is_critical(self):
+        with mock.patch.object(MemoryOptimizer, 'is_memory_critical', return_value=True), \
+                mock.patch.object(MemoryOptimizer, 'force_garbage_collection') as force_gc:
+            memory_optimized(lambda: None)()
+        force_gc.assert_called()
+
+    def test_back_to_back_calls_share_one_critical_check(self):
+        with mock.patch.object(MemoryOptimizer, 'is_memory_critical', return_value=False) as is_critical:
+            wrapped = memory_optimized(lambda: None)
+            wrapped()
+            wrapped()
+        self.assertEqual(is_critical.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, jsonify, Response, stream_template, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, Response, stream_template, stream_with_context, session, redirect, url_for
 from flask_cors import CORS
 import json
 import time
@@ -2376,6 +2376,7 @@ def chat_with_ai():
             'search_performed': search_performed,
             'intent_type': intent.get('intent_type', 'unknown'),
             'intent': intent,  # Include full intent data for movie selection buttons
+            'suggestions': result.get('suggestions', []),  # Searches to try when nothing was found
             'session_info': {
                 'session_id': user_session_id,
                 'conversation_count': session_stats.get('conversation_count', 0),
@@ -2537,7 +2538,7 @@ def chat_with_ai():
             'search_query': primary_search_query,
             'search_queries_used': search_queries,  # Show all queries used
             'suggestions': suggestions,
-            'conversation_history': llm_chat_agent.conversation_history[-10:]  # Keep last 10 messages
+            'conversation_history': list(llm_chat_agent.conversation_history)[-10:]  # Keep last 10 messages
         })
         
     except Exception as e:
@@ -2549,6 +2550,45 @@ def chat_with_ai():
             'suggestions': []
         }), 500
 
+@app.route('/chat/stream', methods=['POST'])
+def chat_with_ai_stream():
+    """Stream the AI chat reply as server-sent events"""
+    data = request.get_json() or {}
+    user_message = data.get('message', '').strip()
+    movie_results = data.get('movie_results', [])
+    
+    if not user_message:
+        return jsonify({'error': 'Message is required'}), 400
+    
+    if not llm_chat_agent:
+        return jsonify({'error': 'AI chat is currently unavailable'}), 503
+    
+    # Reuse session context for follow-ups, same as /chat
+    conversation_context = ""
+    user_session_id = session.get('session_id')
+    if user_session_id:
+        conversation_context = session_manager.get_conversation_context(user_session_id)
+    
+    intent = llm_chat_agent.analyze_user_intent(user_message, conversation_context)
+    
+    def generate():
+        try:
+            for text in llm_chat_agent.generate_contextual_response_stream(user_message, intent, movie_results):
+                yield f"data: {json.dumps({'token': text})}\n\n"
+        except Exception as e:
+            logger.error(f"Chat stream error: {str(e)}")
+            yield f"data: {json.dumps({'error': 'Sorry, I encountered an error. Please try again.'})}\n\n"
+        yield f"data: {json.dumps({'done': True, 'intent_type': intent.get('intent_type', 'unknown'), 'intent': intent})}\n\n"
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
 def extract_movie_titles_from_response(ai_response):
     """Extract movie titles from AI response text"""
     import re